@@ -1,10 +1,16 @@
+import functools
 import os
-from mistralai import Mistral
 
 llm_api_key = os.environ["MISTRAL_API_KEY"]
 llm_model = "mistral-small-latest"
 
-llm_client = Mistral(api_key=llm_api_key)
+
+@functools.cache
+def llm_client():
+    """The client is created on first use: importing mistralai is slow."""
+    from mistralai import Mistral
+
+    return Mistral(api_key=llm_api_key)
 
 
 def log(m):
@@ -17,7 +23,7 @@ def ask_llm_for_translation(system_prompt, user_prompt):
 
     log("Full prompt: " + str(messages))
 
-    chat_response = llm_client.chat.complete(
+    chat_response = llm_client().chat.complete(
         model=llm_model,
         messages=messages,
         max_tokens=5,
@@ -0,0 +1,204 @@
+import enum
+import hashlib
+import hmac
+import io
+import os
+import pickle
+import tempfile
+
+import agentspeak
+import agentspeak.lexer
+import agentspeak.parser
+
+# environment variable giving the directory of the cached ASTs ("" to keep them in memory only)
+CACHE_DIR_VARIABLE = "A2A_AGENTSPEAK_ASL_CACHE"
+
+# first line of the cache files
+MAGIC = b"a2a-agentspeak AST 1\n"
+
+# set to False to always parse the ASL files
+enabled = True
+
+# content hash -> AST, for the files already loaded by this process
+_loaded: dict[str, agentspeak.parser.AstAgent] = {}
+
+# cache directory -> key of the HMACs of its files (None if the directory cannot be used)
+_keys: dict[str, bytes | None] = {}
+
+
+def default_cache_dir() -> str | None:
+    """The directory given by A2A_AGENTSPEAK_ASL_CACHE, or a2a_agentspeak/asl in the user cache directory."""
+    d = os.environ.get(CACHE_DIR_VARIABLE)
+    if d is not None:
+        return d or None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "a2a_agentspeak", "asl")
+
+
+# directory of the cached ASTs (None: no cache on disk)
+cache_dir: str | None = default_cache_dir()
+
+
+class _Pickler(pickle.Pickler):
+    """Pickle the enums by name: some agentspeak enums (BinaryOp, UnaryOp) cannot be found back from their values."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, enum.Enum):
+            return getattr, (type(obj), obj.name)
+        return NotImplemented
+
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("agentspeak")
+    except Exception:
+        return "unknown"
+
+
+def content_hash(content: bytes) -> str:
+    h = hashlib.sha256()
+    h.update(_version().encode())
+    h.update(content)
+    return h.hexdigest()
+
+
+def check_private(directory: str):
+    """Raise PermissionError if the directory may be written by other users (POSIX only)."""
+    if not hasattr(os, "getuid"):
+        return
+    st = os.stat(directory)
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise PermissionError(
+            "the directory is writable by other users or not owned by this user"
+        )
+
+
+def secret_key() -> bytes | None:
+    """The key of the HMACs of the cache files, created with the cache directory.
+    None if there is no cache directory, or if it cannot be used.
+    """
+    if cache_dir is None:
+        return None
+    if cache_dir in _keys:
+        return _keys[cache_dir]
+    key_file = os.path.join(cache_dir, "key")
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        check_private(cache_dir)
+        try:
+            fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(os.urandom(32))
+        except FileExistsError:
+            pass
+        with open(key_file, "rb") as f:
+            key = f.read()
+        if len(key) != 32:
+            raise ValueError("invalid key file " + key_file)
+    except Exception as e:
+        print("Warning: ASL cache disabled (" + cache_dir + "): " + str(e))
+        key = None
+    _keys[cache_dir] = key
+    return key
+
+
+def cache_file_of(key: str) -> str:
+    return os.path.join(cache_dir, key + ".pickle")
+
+
+def signature(secret: bytes, key: str, payload: bytes) -> bytes:
+    return hmac.new(secret, key.encode() + payload, hashlib.sha256).hexdigest().encode()
+
+
+def parse(asl_file: str, content: bytes) -> agentspeak.parser.AstAgent:
+    log = agentspeak.Log(agentspeak.get_logger(__name__), 3)
+    source = io.StringIO(content.decode())
+    source.name = asl_file
+    tokens = agentspeak.lexer.TokenStream(source, log)
+    ast_agent = agentspeak.parser.parse(asl_file, tokens, log)
+    log.throw()
+    return ast_agent
+
+
+def read_cache(
+    cache_file: str, key: str, secret: bytes
+) -> agentspeak.parser.AstAgent | None:
+    """The AST in a cache file, if the file holds that content hash and a valid HMAC (checked before unpickling)."""
+    try:
+        with open(cache_file, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print("Warning: ignoring the ASL cache file " + cache_file + ": " + str(e))
+        return None
+    header = MAGIC + key.encode() + b"\n"
+    if not data.startswith(header):
+        print("Warning: ignoring the ASL cache file " + cache_file + ": bad header")
+        return None
+    mac, _, payload = data[len(header) :].partition(b"\n")
+    if not hmac.compare_digest(mac, signature(secret, key, payload)):
+        print("Warning: ignoring the ASL cache file " + cache_file + ": bad HMAC")
+        return None
+    try:
+        return pickle.loads(payload)
+    except Exception as e:
+        print("Warning: ignoring the ASL cache file " + cache_file + ": " + str(e))
+        return None
+
+
+def write_cache(
+    cache_file: str, key: str, secret: bytes, ast_agent: agentspeak.parser.AstAgent
+):
+    try:
+        f = io.BytesIO()
+        _Pickler(f, pickle.HIGHEST_PROTOCOL).dump(ast_agent)
+        payload = f.getvalue()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC + key.encode() + b"\n")
+                f.write(signature(secret, key, payload) + b"\n")
+                f.write(payload)
+            os.replace(tmp, cache_file)  # readers never see a partial file
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception as e:
+        print(
+            "Warning: could not write the ASL cache file " + cache_file + ": " + str(e)
+        )
+
+
+def load_ast(asl_file: str) -> agentspeak.parser.AstAgent:
+    """The AST of an ASL file. It is parsed only if its content was never seen:
+    the ASTs are kept in memory and on disk (in cache_dir), keyed by the hash of the content.
+    The ASTs are not modified when agents are built from them, so they can be shared.
+
+    The cache files are unpickled, so cache_dir must be writable only by the user running
+    the agents (a directory writable by other users is not used). Each file holds the content
+    hash and an HMAC of the AST, checked before unpickling, with a key kept in cache_dir.
+    """
+    with open(asl_file, "rb") as f:
+        content = f.read()
+    if not enabled:
+        return parse(asl_file, content)
+    key = content_hash(content)
+    ast_agent = _loaded.get(key)
+    if ast_agent is not None:
+        return ast_agent
+    secret = secret_key()
+    if secret is None:
+        ast_agent = parse(asl_file, content)
+    else:
+        cache_file = cache_file_of(key)
+        ast_agent = read_cache(cache_file, key, secret)
+        if ast_agent is None:
+            ast_agent = parse(asl_file, content)
+            write_cache(cache_file, key, secret, ast_agent)
+    _loaded[key] = ast_agent
+    return ast_agent
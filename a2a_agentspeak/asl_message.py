@@ -1,11 +1,22 @@
 import agentspeak
 import ast
-from dataclasses import dataclass
+import functools
+from dataclasses import dataclass, field
 
 from agentspeak import LinkedList
 
+from a2a_agentspeak.term_parser import TermSyntaxError, parse_literal
+
 
 def lit_of_str(s: str) -> agentspeak.Literal:
+    try:
+        return parse_literal(s)
+    except TermSyntaxError:
+        return lit_of_str_eval(s)
+
+
+def lit_of_str_eval(s: str) -> agentspeak.Literal:
+    """Previous conversion, based on Python literals. Used for contents which are not AgentSpeak terms."""
     l = s.split(sep="(", maxsplit=1)
     symb = l[0]
     if len(l) == 1:
@@ -31,12 +42,25 @@ def lit_of_str(s: str) -> agentspeak.Literal:
                 return agentspeak.Literal(symb, (t,))
 
 
+@functools.lru_cache(maxsize=1024)
+def frozen_lit_of_str(s: str) -> agentspeak.Literal:
+    """lit_of_str, frozen and memoized (the same contents are received again and again).
+    The hits and misses of the cache are given by frozen_lit_of_str.cache_info().
+    """
+    return lit_of_str(s).freeze({}, {})
+
+
 def strplan(p: str):
     return agentspeak.Literal("plain_text", (p,))
 
 
+@functools.lru_cache(maxsize=256)
+def source_annotation(s: str) -> agentspeak.Literal:
+    return agentspeak.Literal("source", (agentspeak.Literal(s),))
+
+
 def add_source(lit: agentspeak.Literal, s: str) -> agentspeak.Literal:
-    return lit.with_annotation(agentspeak.Literal("source", (agentspeak.Literal(s),)))
+    return lit.with_annotation(source_annotation(s))
 
 
 @dataclass
@@ -44,6 +68,8 @@ class AgentSpeakMessage:
     illocution: str
     content: str
     sender: str
+    # other metadata of the message (for instance the options of a long-poll ask)
+    options: dict = field(default_factory=dict)
 
     def goal_type(self) -> agentspeak.GoalType:
         _i = self.illocution
@@ -69,8 +95,16 @@ class AgentSpeakMessage:
         _i = self.illocution
         _c = self.content
         _s = self.sender
-        if _i in ["tell", "untell", "achieve", "unachieve", "ask"]:
-            return add_source(lit_of_str(_c).freeze({}, {}), _s)
+        if _i in [
+            "tell",
+            "untell",
+            "achieve",
+            "unachieve",
+            "ask",
+            "subscribe",
+            "unsubscribe",
+        ]:
+            return add_source(frozen_lit_of_str(_c), _s)
         elif _i in ["tellHow", "untellHow"]:
             return add_source(strplan(_c).freeze({}, {}), _s)
         else:
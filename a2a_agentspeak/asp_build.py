@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from a2a.types import (
     AgentCapabilities,
@@ -6,20 +7,26 @@ from a2a.types import (
     AgentCard,
 )
 
-
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-
-from a2a_agentspeak import asi_parser
+from a2a_agentspeak import asi_parser, asl_cache
 from a2a_agentspeak.asi_parser import Kind
-from a2a_agentspeak.bdi import BDIAgentExecutor
 
 import agentspeak
 
-from a2a_agentspeak.check import check_achievement, check_input_belief, check_ask_belief
+from a2a_agentspeak.check import (
+    CHECKED_ILLOCUTIONS,
+    TriggerIndex,
+    asked_arity,
+    check_skill,
+)
 from a2a_agentspeak.skill import ASLSkill, a2a_skill_of_asl_skill
 
+# the a2a server stack (starlette, httpx...) is only loaded by build_server
+if TYPE_CHECKING:
+    from a2a.server.tasks import TaskStore
+
+    from a2a_agentspeak.connection_pool import ConnectionPool
+    from a2a_agentspeak.server import AgentSpeakServer
+
 PROTOCOL_URI = "https://github.com/Julien-Cohen/a2a-agentspeak/blob/main/a2a_agentspeak/MOSAICO_A2A_AGENTSPEAK_PROTOCOL"
 EXTENSION = AgentExtension(
     uri=PROTOCOL_URI, description="MOSAICO A2A AgentSpeak", required=True
@@ -57,6 +64,7 @@ class AgentSpeakInterface:
         self.url = url
         self.implementation_file = implementation
         self.additional_tools = additional_tools
+        self._ast_agent = None
 
     def publish_ask(self, id, doc, literal, arity):
         self.skills.append(
@@ -76,72 +84,107 @@ class AgentSpeakInterface:
     def public_literals(self):
         return [s.literal for s in self.skills]
 
+    def ask_arities(self) -> dict[str, int]:
+        """The arity of the beliefs read by each ask skill (see check.asked_arity)."""
+        index = TriggerIndex(self.ast_agent())
+        return {
+            s.literal: asked_arity(s.arity, index.belief_arities(s.literal))
+            for s in self.skills
+            if s.illocution == "ask"
+        }
+
+    def ast_agent(self) -> agentspeak.parser.AstAgent:
+        """The AST of the implementation, parsed once and shared by check and build_server (see asl_cache)."""
+        if self._ast_agent is None:
+            self._ast_agent = asl_cache.load_ast(self.implementation_file)
+        return self._ast_agent
+
     def build_card(self):
         return build_agent_card(self.name, self.doc, self.url, self.skills)
 
-    def build_server(self):
+    def build_server(
+        self,
+        pool: "ConnectionPool | None" = None,
+        task_store: "TaskStore | None" = None,
+        card_max_age: int = 300,
+        **agent_options,
+    ) -> "AgentSpeakServer":
+        """Build the A2A server of the agent.
+        The agent sends its messages through the given connection pool, or through its own pool if none is given.
+        The tasks are kept in the given task store, or in a BoundedTaskStore with default limits.
+        Clients may reuse the agent card for card_max_age seconds.
+        The other options are given to the BDIAgent (for instance outbox_size and outbox_workers).
+        """
+        from a2a.server.request_handlers import DefaultRequestHandler
+
+        from a2a_agentspeak.bdi import BDIAgentExecutor
+        from a2a_agentspeak.server import AgentSpeakServer
+        from a2a_agentspeak.task_store import BoundedTaskStore
+
         executor = BDIAgentExecutor(
             self.implementation_file,
             self.public_literals(),
             self.url,
             additional_tools=self.additional_tools,
+            pool=pool,
+            ask_arities=self.ask_arities(),
+            ast_agent=self.ast_agent(),
+            **agent_options,
         )
 
         request_handler = DefaultRequestHandler(
             agent_executor=executor,
-            task_store=InMemoryTaskStore(),
+            task_store=BoundedTaskStore() if task_store is None else task_store,
         )
-        return A2AStarletteApplication(
-            agent_card=self.build_card(), http_handler=request_handler
+        return AgentSpeakServer(
+            executor,
+            card_max_age=card_max_age,
+            agent_card=self.build_card(),
+            http_handler=request_handler,
         )
 
     @dataclass
     class Result:
         success: bool
-        reason: str | None
+        reason: str | None  # the literal of the first mismatch
+        mismatches: list[str] = field(default_factory=list)
 
     def check(self) -> Result:
         """Check that the public interface correspond to actual triggers in implementation.
         More precisely:
-         * achievements declared in the interface must have a trigger (we do not consider plans that would be added dynamically with askHow or tellHow).
+         * achievements declared in the interface must have a trigger +!g (we do not consider plans that would be added dynamically with askHow or tellHow).
          * belief literals which can be asked must occur in the implementation (we do not consider beliefs that are perceived during execution and which are not handled by the start implementation)
-         * beliefs that are told to that agent must occur too in the start implementation.
+         * beliefs that are told to that agent must occur too in the start implementation, as trigger +b.
+        The arities must be the ones declared in the interface. All the mismatches are reported.
         """
-        LOGGER = agentspeak.get_logger(__name__)
-        with open(self.implementation_file) as source:
-            log = agentspeak.Log(LOGGER, 3)
-            tokens = agentspeak.lexer.TokenStream(source, log)
-            ast_agent: agentspeak.parser.ASTAgent = agentspeak.parser.parse(
-                source.name, tokens, log
-            )
-            log.throw()
-
-        # exists
+        index = TriggerIndex(self.ast_agent())
+
+        reason = None
+        mismatches = []
         for s in self.skills:
-            if s.illocution == "achieve":
-                if not check_achievement(s.literal, ast_agent):
-                    return self.Result(False, s.literal)
-            elif s.illocution == "tell":
-                if not check_input_belief(s.literal, ast_agent):
-                    return self.Result(False, s.literal)
-            elif s.illocution == "ask":
-                if not check_ask_belief(s.literal, ast_agent):
-                    return self.Result(False, s.literal)
+            if s.illocution in CHECKED_ILLOCUTIONS:
+                m = check_skill(s.illocution, s.literal, s.arity, index)
+                if m is not None:
+                    if reason is None:
+                        reason = s.literal
+                    mismatches.append(m)
             else:
                 print(
                     "WARNING: implementation not checked against skill in the interface: "
                     + str(s)
                     + " (FIXME)"
                 )
-        return self.Result(True, None)
+        return self.Result(not mismatches, reason, mismatches)
 
     def add_new_actions_callback(self, callback):
         self.new_actions_callback = callback
 
 
 class InterfaceError(Exception):
-    def __init__(self, token):
+    def __init__(self, token, mismatches: list[str] | None = None):
+        super().__init__("; ".join(mismatches) if mismatches else token)
         self.token = token
+        self.mismatches = [] if mismatches is None else mismatches
 
 
 def from_file(intf: str, impl: str, url: str, tools=frozenset()) -> AgentSpeakInterface:
@@ -161,6 +204,15 @@ def from_file(intf: str, impl: str, url: str, tools=frozenset()) -> AgentSpeakIn
 
     r = a.check()
     if not r.success:
-        raise InterfaceError(r.reason)
+        raise InterfaceError(r.reason, r.mismatches)
     else:
         return a
+
+
+def __getattr__(name):
+    # AgentSpeakServer moved to a2a_agentspeak.server (loaded on first use)
+    if name == "AgentSpeakServer":
+        from a2a_agentspeak.server import AgentSpeakServer
+
+        return AgentSpeakServer
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
@@ -1,4 +1,9 @@
 import asyncio
+import concurrent.futures
+import functools
+import json
+import math
+import threading
 
 import httpx
 
@@ -9,23 +14,32 @@ import agentspeak.ext_stdlib
 from dataclasses import dataclass
 
 from a2a.client import (
-    A2ACardResolver,
-    A2AClient,
     A2AClientJSONError,
     A2AClientHTTPError,
-    A2AClientTimeoutError,
 )
 from a2a.server.events import EventQueue
-from a2a.utils import new_agent_text_message
-
-from a2a_agentspeak.asl_message import AgentSpeakMessage
+from a2a.types import Part, TextPart
+from a2a.utils import new_agent_parts_message, new_agent_text_message
+
+from a2a_agentspeak import asl_cache
+from a2a_agentspeak.asl_message import AgentSpeakMessage, frozen_lit_of_str
+from a2a_agentspeak.belief_index import (
+    BeliefSnapshot,
+    IndexedAgent,
+    add_index_actions,
+)
+from a2a_agentspeak.term_parser import TermSyntaxError, parse_list
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 
 import a2a_agentspeak.message_codec as message_tools
-from a2a_agentspeak.message_codec import asl_of_a2a
+from a2a_agentspeak.message_codec import asl_list_of_a2a
 
+from a2a_agentspeak.card_cache import CardCache, default_card_cache
 from a2a_agentspeak.check import check_illoc
+from a2a_agentspeak.connection_pool import ConnectionPool, local_key
+from a2a_agentspeak.outbox import Outbox, OutgoingBatch, OutgoingMessage
+from a2a_agentspeak.scheduler import Scheduler
 from a2a_agentspeak.tool import Tool
 
 
@@ -36,50 +50,196 @@ class CatalogEntry:
     meaning: str
 
 
-async def do_send(to_url: str, illoc: str, content: str, my_url: str):
-    async with httpx.AsyncClient() as httpx_client:
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+async def do_send(
+    httpx_client: httpx.AsyncClient,
+    to_url: str,
+    illoc: str,
+    content: str,
+    my_url: str,
+    card_cache: CardCache = default_card_cache,
+) -> bool:
+    """Send a message with a client that is not closed afterwards (see ConnectionPool).
+    The card of the destination is not needed: the request is posted to to_url.
+    If the destination fails, its card is removed from the card cache (it may have moved).
+    Return True if the destination acknowledged the message.
+    """
+    return await do_send_all(
+        httpx_client, to_url, [(illoc, content)], my_url, card_cache
+    )
+
+
+async def do_send_all(
+    httpx_client: httpx.AsyncClient,
+    to_url: str,
+    messages: list[tuple[str, str]],
+    my_url: str,
+    card_cache: CardCache = default_card_cache,
+) -> bool:
+    """Like do_send, for several (illocution, content) sent in one multi-part message."""
+    try:
+        # the request is serialized directly (see message_codec.encode_multipart_request)
+        body = message_tools.encode_multipart_request(messages, my_url)
+        try:
+            response = await httpx_client.post(
+                to_url, content=body, headers=JSON_HEADERS
+            )
+            response.raise_for_status()
+            print(
+                "Message sent and synchronous answer received: "
+                + message_tools.extract_text_of_json(response.json())
+            )
+            return True
+        except httpx.TimeoutException:
+            print("Warning: no acknowledgement received before timeout.")
+            return False
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(503, "Network communication error: " + str(e))
+
+    except A2AClientJSONError as e:
+        card_cache.invalidate(to_url)
+        print("---FAIL---: ASL agent failed to send (JSON). " + str(e))
+    except A2AClientHTTPError as e:
+        card_cache.invalidate(to_url)
+        print("---FAIL---: ASL agent failed to send (HTTP). " + str(e))
+    except Exception as e:
+        print("---FAIL---: ASL agent failed to send (other). " + str(e))
+    return False
+
+
+def _fail(agent: agentspeak.runtime.Agent, intention: agentspeak.runtime.Intention):
+    return False
+
+
+async def reply(output_event_queue: EventQueue, r: str, metadata: dict | None = None):
+    message = new_agent_text_message(r)
+    if metadata is not None:
+        message.metadata = metadata
+    await output_event_queue.enqueue_event(message)
+
+
+async def reply_parts(
+    output_event_queue: EventQueue, texts: list[str], metadata: dict | None = None
+):
+    """One reply with several text parts."""
+    message = new_agent_parts_message([Part(root=TextPart(text=t)) for t in texts])
+    if metadata is not None:
+        message.metadata = metadata
+    await output_event_queue.enqueue_event(message)
+
+
+def _wake(f: asyncio.Future):
+    if not f.done():
+        f.set_result(None)
+
+
+def ask_literals(content: str) -> list[agentspeak.Literal]:
+    """The literals asked by the content of an ask request: one literal, or a list of literals."""
+    if content.lstrip().startswith("["):
+        try:
+            l = parse_list(content)
+            if all(isinstance(t, agentspeak.Literal) for t in l):
+                return list(l)
+        except TermSyntaxError:
+            pass
+    return [frozen_lit_of_str(content)]
 
-        resolver = A2ACardResolver(
-            httpx_client=httpx_client,
-            base_url=to_url,
-        )
 
-        try:
-            _public_card = await resolver.get_agent_card()
+def merge_delta(
+    pending: dict[agentspeak.Literal, str], l: agentspeak.Literal, illoc: str
+):
+    """Add a change (tell or untell) of a belief to the pending changes.
+    It cancels a pending opposite change of the same belief.
+    """
+    if pending.get(l, illoc) != illoc:
+        del pending[l]
+    else:
+        pending[l] = illoc
 
-            client = A2AClient(
-                # httpx_client=httpx_client, agent_card=_public_card
-                httpx_client=httpx_client,
-                url=to_url,
-            )
 
-            request = message_tools.build_basic_request(illoc, content, my_url)
-            try:
-                response = await client.send_message(request)
-                print(
-                    "Message sent and synchronous answer received: "
-                    + message_tools.extract_text(response)
-                )
-            except A2AClientTimeoutError:
-                print("Warning: no acknowledgement received before timeout.")
+class Notification(OutgoingBatch):
+    """The changes of beliefs sent to a subscriber (see BDIAgent.flush_deltas)."""
+
+
+# agents served by this process, indexed by local_key of their URL
+local_agents: dict[str, "BDIAgentExecutor"] = {}
+
+
+def find_local_agent(url: str) -> "BDIAgentExecutor | None":
+    return local_agents.get(local_key(url))
 
-        except A2AClientJSONError as e:
-            print("---FAIL---: ASL agent failed to send (JSON). " + str(e))
-        except A2AClientHTTPError as e:
-            print("---FAIL---: ASL agent failed to send (HTTP). " + str(e))
-        except Exception as e:
-            print("---FAIL---: ASL agent failed to send (other). " + str(e))
 
+class LocalReply:
+    """Collects the reply to a message delivered in-process (used in place of an EventQueue)."""
 
-async def reply(output_event_queue: EventQueue, r: str):
-    await output_event_queue.enqueue_event(new_agent_text_message(r))
+    def __init__(self):
+        self.events = []
+
+    async def enqueue_event(self, event):
+        self.events.append(event)
+
+    def text(self) -> str:
+        return "".join(
+            p.root.text for e in self.events for p in e.parts if hasattr(p.root, "text")
+        )
 
 
 class BDIAgent:
-    def __init__(self, asl_file: str, url: str, additional_tools: set[Tool]):
+    def __init__(
+        self,
+        asl_file: str,
+        url: str,
+        additional_tools: set[Tool],
+        pool: ConnectionPool | None = None,
+        outbox_size: int = 100,
+        outbox_workers: int = 4,
+        mode: str = "inline",
+        batch_size: int = 32,
+        max_linger: float = 0.0,
+        scheduler: Scheduler | None = None,
+        ask_arities: dict[str, int] | None = None,
+        subscription_window: float = 0.05,
+        ast_agent: agentspeak.parser.AstAgent | None = None,
+        poll_timeout: float = 30.0,
+        max_poll_timeout: float = 60.0,
+    ):
+        """The reasoning cycles run according to the given scheduler,
+        or to a new scheduler with the given mode, batch_size and max_linger (see Scheduler).
+        ask_arities gives the arity of the beliefs which can be asked (1 for the others).
+        The changes of beliefs notified to subscribers are merged over subscription_window seconds.
+        ast_agent is the already parsed asl_file, if any (otherwise it is loaded through asl_cache).
+        A long-poll ask waits poll_timeout seconds when it gives no timeout, and never more than max_poll_timeout seconds.
+        """
         self.my_url = url
+        self.poll_timeout = poll_timeout
+        self.max_poll_timeout = max_poll_timeout
+        self.ask_arities = {} if ask_arities is None else ask_arities
+        # beliefs readable by ask requests (all of them if no arity is given)
+        self.public_functors = None if ask_arities is None else set(ask_arities)
+
+        # outbound connections (closed on shutdown only if owned by this agent)
+        self.owns_pool = pool is None
+        self.pool = ConnectionPool() if pool is None else pool
+
+        # messages sent by .send wait there for a sender worker
+        self.outbox = Outbox(self.send, max_size=outbox_size, workers=outbox_workers)
+
+        self.owns_scheduler = scheduler is None
+        self.scheduler = (
+            Scheduler(mode=mode, batch_size=batch_size, max_linger=max_linger)
+            if scheduler is None
+            else scheduler
+        )
+        self.env = self.scheduler.env
 
-        self.env = agentspeak.runtime.Environment()
+        # thread pools of the "threaded" tools
+        self.tool_executors = []
 
         # add custom actions (must occur before loading the asl file)
         self.bdi_actions = agentspeak.Actions(agentspeak.ext_stdlib.actions)
@@ -87,14 +247,35 @@ class BDIAgent:
         for t in additional_tools:
             self.add_tool(t)
 
-        with open(asl_file) as source:
-            self.asp_agent = self.env.build_agent(source, self.bdi_actions)
-
-        self.env.run()
+        with self.scheduler.lock:
+            if ast_agent is None:
+                ast_agent = asl_cache.load_ast(asl_file)
+            self.asp_agent = self.env.build_agent_from_ast(
+                None, ast_agent, self.bdi_actions, agent_cls=IndexedAgent, name=asl_file
+            )[1]
+            # ask requests read a snapshot of the beliefs, published after each cycle
+            self.snapshot = BeliefSnapshot()
+            # long-poll asks waiting for the next snapshot
+            self.snapshot_waiters: list[asyncio.Future] = []
+            self.waiters_lock = threading.Lock()
+            # peers subscribed to public beliefs: functor -> URLs (see subscribe)
+            self.subscriptions: dict[str, set[str]] = {}
+            self.subscription_window = subscription_window
+            # changes not notified yet: URL -> belief -> tell or untell
+            self.pending_deltas: dict[str, dict[agentspeak.Literal, str]] = {}
+            # subscribers with a message in the outbox
+            self.notifying: set[str] = set()
+            self.flush_scheduled = False
+            self.deltas_lock = threading.Lock()
+            self.publish_snapshot()
+            self.scheduler.add_cycle_listener(self.publish_snapshot)
+
+        self.scheduler.submit(lambda: None)  # initial goals
 
     # this method is called by __init__
     def add_custom_actions(self):
         actions = self.bdi_actions
+        add_index_actions(actions)
 
         @actions.add("jump", 0)
         def _jump(a: agentspeak.runtime.Agent, t, i):
@@ -105,79 +286,578 @@ class BDIAgent:
         def _print_float(a):
             print(str(a))
 
-        @actions.add_procedure(".send", (None, agentspeak.Literal, None))
+        # fails (as an action) when the outbox is full
+        @actions.add_predicate(".send", (None, agentspeak.Literal, None))
         def _send_to_url(
             u: agentspeak.Literal, illoc: agentspeak.Literal, t: agentspeak.Literal
-        ):
+        ) -> bool:
             assert check_illoc(illoc)
-            asyncio.create_task(do_send(str(u), str(illoc), str(t), self.my_url))
+            if self.queue_message(OutgoingMessage(str(u), str(illoc), str(t))):
+                return True
+            else:
+                print("Warning: outbox full, message to " + str(u) + " not sent.")
+                return False
 
     def add_tool(self, tool: Tool):
         if tool.kind == "function":
             self.bdi_actions.add_function(
                 tool.action_name, tool.arity, tool.implementation
             )
+        elif tool.kind == "coroutine":
+
+            def start(*args):
+                return self.scheduler.run_coroutine(
+                    asyncio.wait_for(tool.implementation(*args), tool.timeout)
+                )
+
+            self.add_suspending_action(tool.action_name, tool.arity, start)
+        elif tool.kind == "threaded":
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=tool.max_concurrency,
+                thread_name_prefix="tool" + tool.action_name,
+            )
+            self.tool_executors.append(executor)
+
+            async def call(*args):
+                # the timeout includes the time spent waiting for a free thread
+                return await asyncio.wait_for(
+                    asyncio.wrap_future(executor.submit(tool.implementation, *args)),
+                    tool.timeout,
+                )
+
+            self.add_suspending_action(
+                tool.action_name,
+                tool.arity,
+                lambda *args: self.scheduler.run_coroutine(call(*args)),
+            )
         else:
             print("This kind of tool is not supported yet: " + tool.kind)
 
-    def process_message(self, msg: AgentSpeakMessage):
-        """Process tell, and achieve requests following the AgentSpeak defined behavior."""
+    def add_suspending_action(self, name: str, arg_specs: tuple, start):
+        """Add an action which behaves like a function (its result is unified with its last argument),
+        but which suspends the intention until the result is available instead of blocking the agent.
+        start must return a concurrent.futures.Future of the result.
+        The action fails if the future fails, or if its result does not unify.
+        Such actions must occur as formulas of plan bodies (not in conditions).
+        """
+
+        def resume(intention, term, instr, future: concurrent.futures.Future):
+            intention.waiter = None
+            try:
+                ok = agentspeak.unify(
+                    term.args[-1], future.result(), intention.scope, intention.stack
+                )
+            except asyncio.TimeoutError:
+                print("Action " + name + " failed: timeout.")
+                ok = False
+            except Exception as e:
+                print("Action " + name + " failed: " + str(e))
+                ok = False
+            if not ok:
+                # the intention continues as if the action had failed
+                failure = agentspeak.runtime.Instruction(_fail, instr.loc)
+                failure.failure = instr.failure
+                intention.instr = failure
+
+        def action(
+            a: agentspeak.runtime.Agent,
+            term: agentspeak.Literal,
+            intention: agentspeak.runtime.Intention,
+        ):
+            args = agentspeak._zip_specs(arg_specs, a, term.args, intention.scope)
+            instr = intention.instr  # the instruction which calls this action
+            intention.waiter = agentspeak.runtime.Waiter()  # suspended until resume
+
+            def done(f: concurrent.futures.Future):
+                try:
+                    self.scheduler.submit(
+                        functools.partial(resume, intention, term, instr, f)
+                    )
+                except Exception as e:  # inline mode
+                    print("---FAIL---: reasoning cycle failed. " + str(e))
+
+            start(*args).add_done_callback(done)
+            yield
+
+        self.bdi_actions.add(name, agentspeak._count_specs(arg_specs) + 1, action)
+
+    def queue_message(self, m: OutgoingMessage) -> bool:
+        loop = self.scheduler.loop
+        if self.scheduler.in_reasoning_thread() and loop is not None:
+            # the reasoning thread waits for room in the outbox (backpressure)
+            try:
+                asyncio.run_coroutine_threadsafe(self.outbox.put(m), loop).result()
+                return True
+            except RuntimeError:
+                return False
+        else:
+            return self.outbox.offer(m)
+
+    async def send(self, m: OutgoingMessage | OutgoingBatch) -> bool:
+        try:
+            return await self.deliver(m)
+        finally:
+            if isinstance(m, Notification):
+                self.notified(m.to_url)
+
+    async def deliver(self, m: OutgoingMessage | OutgoingBatch) -> bool:
+        target = find_local_agent(m.to_url)
+        if target is not None:
+            # loopback: no HTTP for an agent served by this process
+            msgs = [AgentSpeakMessage(i, c, self.my_url) for i, c in m.parts()]
+            r = await target.receive_local(msgs)
+            print("Message sent and synchronous answer received: " + r)
+            return True
+        return await do_send_all(
+            self.pool.client_for(m.to_url),
+            m.to_url,
+            m.parts(),
+            self.my_url,
+        )
+
+    async def startup(self):
+        self.scheduler.bind_loop(asyncio.get_running_loop())
+        self.scheduler.start()
+        self.outbox.start()
+
+    async def shutdown(self):
+        # the outbox is drained first: its loopback deliveries may need the scheduler
+        await self.outbox.close()
+        if self.owns_scheduler:
+            await self.scheduler.stop()
+        for executor in self.tool_executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self.owns_pool:
+            await self.pool.aclose()
+
+    def post_message(self, msg: AgentSpeakMessage):
+        """Post the event corresponding to a message (must occur in the reasoning context)."""
         self.asp_agent.call(
             msg.trigger(),
             msg.goal_type(),
             msg.literal(),
             agentspeak.runtime.Intention(),
         )
-        self.env.run()
 
-    def extract_from_beliefs(self, a: str):
-        r = self.asp_agent.beliefs[(a, 1)]  # fixme : arity
-        assert isinstance(r, set)
-        if r == set():
-            return None
-        else:
-            tmp = next(iter(r))
-            assert isinstance(tmp, agentspeak.Literal)
-            assert tmp.functor == a
-            assert isinstance(tmp.args, tuple)
-            return tmp.args[0]
-
-    def get_belief(self, s: str) -> str | None:
-        r = self.extract_from_beliefs(s)
-        if r is not None:
-            return str(r)
+    def post_messages(self, msgs: list[AgentSpeakMessage]):
+        """Post the events of several messages, in order (must occur in the reasoning context).
+        All of them are posted or none: if an event fails (for instance an achieve whose plans
+        are not applicable), the changes made by the previous ones are undone.
+        """
+        events = [(m.trigger(), m.goal_type(), m.literal()) for m in msgs]
+        checkpoint = self.asp_agent.checkpoint(
+            {l.literal_group() for _, g, l in events if g == agentspeak.GoalType.belief}
+        )
+        try:
+            for trigger, goal_type, literal in events:
+                self.asp_agent.call(
+                    trigger, goal_type, literal, agentspeak.runtime.Intention()
+                )
+        except agentspeak.runtime.AslError as e:
+            self.asp_agent.rollback(checkpoint)
+            print("---FAIL---: multi-part message not applied. " + str(e))
+
+    def has_plan(self, m: AgentSpeakMessage) -> bool:
+        """Whether the agent has a plan for the event of that message (it may still not be applicable)."""
+        lit = m.literal()
+        return bool(
+            self.asp_agent.plans.get(
+                (m.trigger(), m.goal_type(), lit.functor, len(lit.args))
+            )
+        )
+
+    def process_message(self, msg: AgentSpeakMessage):
+        """Process tell, and achieve requests following the AgentSpeak defined behavior.
+        Depending on the mode of the scheduler, the reasoning cycle runs now,
+        or later for the whole batch of messages received in the meantime.
+        """
+        self.scheduler.submit(functools.partial(self.post_message, msg))
+
+    def process_messages(self, msgs: list[AgentSpeakMessage]):
+        """Process several messages at once: their events are posted together, in order,
+        before the reasoning cycle (no other message is interleaved).
+        """
+        self.scheduler.submit(functools.partial(self.post_messages, msgs))
+
+    def ask_pattern(self, lit: agentspeak.Literal) -> agentspeak.Literal:
+        """The pattern of an asked literal: the literal itself, possibly with variables,
+        or only a functor (then any belief with that functor and the declared arity).
+        """
+        if not lit.args:
+            arity = self.ask_arities.get(lit.functor, 1)
+            lit = agentspeak.Literal(
+                lit.functor, tuple(agentspeak.Var() for _ in range(arity))
+            )
+        return lit
+
+    def publish_snapshot(self):
+        """Publish the changes of the public beliefs (must occur in the reasoning context)."""
+        previous = self.snapshot
+        snapshot = self.asp_agent.snapshot(previous, self.public_functors)
+        if snapshot is not previous:
+            # a new subscriber gets each snapshot either as its initial beliefs or as changes (see subscribe)
+            with self.deltas_lock:
+                self.snapshot = snapshot
+                if self.subscriptions:
+                    self.collect_deltas(previous, snapshot)
+            with self.waiters_lock:
+                waiters, self.snapshot_waiters = self.snapshot_waiters, []
+            for f in waiters:
+                f.get_loop().call_soon_threadsafe(_wake, f)
+
+    def subscribe(self, url: str, functor: str):
+        """Notify the peer at that URL of the changes of the beliefs with that functor
+        (tell and untell, in multi-part messages), starting with the current beliefs.
+        """
+        with self.deltas_lock:
+            self.subscriptions.setdefault(functor, set()).add(url)
+            snapshot = self.snapshot
+            pending = self.pending_deltas.setdefault(url, {})
+            for group in snapshot.groups:
+                if group[0] == functor:
+                    for l in snapshot.values(group):
+                        merge_delta(pending, l, "tell")
+            self.schedule_flush()
+
+    def unsubscribe(self, url: str, functor: str):
+        with self.deltas_lock:
+            self.subscriptions.get(functor, set()).discard(url)
+            if not self.subscriptions.get(functor, True):
+                del self.subscriptions[functor]
+            pending = self.pending_deltas.get(url, {})
+            for l in [l for l in pending if l.functor == functor]:
+                del pending[l]
+
+    def collect_deltas(self, old: BeliefSnapshot, new: BeliefSnapshot):
+        """Record the changes between two snapshots for the subscribers (deltas_lock held)."""
+        for group, version in new.changed_at.items():
+            if version != new.version or group[0] not in self.subscriptions:
+                continue
+            before = old.values(group)
+            after = new.values(group)
+            deltas = [(l, "tell") for l in after - before]
+            deltas += [(l, "untell") for l in before - after]
+            for url in self.subscriptions[group[0]]:
+                pending = self.pending_deltas.setdefault(url, {})
+                for l, illoc in deltas:
+                    merge_delta(pending, l, illoc)
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        """Flush the pending changes in subscription_window seconds (deltas_lock held)."""
+        if self.pending_deltas and not self.flush_scheduled:
+            self.flush_scheduled = True
+            # started when the event loop is known (see Scheduler.run_coroutine)
+            self.scheduler.run_coroutine(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(self.subscription_window)
+        self.flush_deltas()
+
+    def flush_deltas(self):
+        """Send the pending changes: one multi-part message per subscriber.
+        A subscriber has at most one message in the outbox, so that it gets the changes in order:
+        the next changes are sent once it is sent (see notified).
+        """
+        with self.deltas_lock:
+            self.flush_scheduled = False
+            batches = []
+            for url in list(self.pending_deltas):
+                if url in self.notifying:
+                    continue
+                deltas = self.pending_deltas.pop(url)
+                if deltas:
+                    self.notifying.add(url)
+                    batches.append((url, deltas))
+        for url, deltas in batches:
+            parts = sorted(
+                ((illoc, str(l)) for l, illoc in deltas.items()),
+                key=lambda p: (p[0] != "untell", p[1]),
+            )
+            if self.queue_message(Notification(url, parts)):
+                continue
+            with self.deltas_lock:
+                self.notifying.discard(url)
+                if self.outbox.closed:
+                    print(
+                        "Warning: agent stopped, changes not sent to subscriber " + url
+                    )
+                    continue
+                print(
+                    "Warning: outbox full, changes to subscriber " + url + " delayed."
+                )
+                # sent again later, with the changes made in the meantime
+                for l, illoc in self.pending_deltas.pop(url, {}).items():
+                    merge_delta(deltas, l, illoc)
+                self.pending_deltas[url] = deltas
+                self.schedule_flush()
+
+    def notified(self, url: str):
+        """The message sent to a subscriber left the outbox: send the next changes, if any."""
+        with self.deltas_lock:
+            self.notifying.discard(url)
+            if self.pending_deltas.get(url):
+                self.schedule_flush()
+
+    async def next_snapshot(self, version: int) -> BeliefSnapshot:
+        """Wait for a snapshot newer than the given version."""
+        while self.snapshot.version <= version:
+            f = asyncio.get_running_loop().create_future()
+            with self.waiters_lock:
+                self.snapshot_waiters.append(f)
+            try:
+                if self.snapshot.version <= version:  # not published in the meantime
+                    await f
+            finally:
+                # still there if the wait was cancelled (timeout)
+                with self.waiters_lock:
+                    if f in self.snapshot_waiters:
+                        self.snapshot_waiters.remove(f)
+        return self.snapshot
+
+    def poll_options(self, options: dict) -> tuple[int | None, float]:
+        """The version and the timeout of a long-poll ask, from the options of the message
+        (the timeout is bounded by max_poll_timeout). Raise ValueError if they are not valid.
+        """
+        after_version = options.get("after_version")
+        if after_version is not None:
+            if isinstance(after_version, str) and after_version.strip().isdigit():
+                after_version = int(after_version)
+            elif isinstance(after_version, float) and after_version.is_integer():
+                after_version = int(after_version)
+            if (
+                not isinstance(after_version, int)
+                or isinstance(after_version, bool)
+                or after_version < 0
+            ):
+                raise ValueError(
+                    "after_version must be a snapshot version (a natural number)."
+                )
+        timeout = options.get("timeout")
+        if timeout is None:
+            timeout = self.poll_timeout
         else:
+            try:
+                if isinstance(timeout, bool):
+                    raise ValueError()
+                timeout = float(timeout)
+            except (TypeError, ValueError):
+                raise ValueError("timeout must be a number of seconds.")
+            if not math.isfinite(timeout) or timeout < 0:
+                raise ValueError("timeout must be a number of seconds.")
+        return after_version, min(timeout, self.max_poll_timeout)
+
+    async def wait_and_answer(
+        self,
+        lit: agentspeak.Literal,
+        after_version: int | None,
+        timeout: float,
+    ) -> tuple[str | None, BeliefSnapshot, bool]:
+        """Long-poll ask: wait until the asked beliefs changed after the given version
+        (or, without version, until a belief matches), at most timeout seconds.
+        Return the answer, the snapshot it was read in, and whether the wait timed out.
+        """
+        pattern = self.ask_pattern(lit)
+        snapshot = self.snapshot
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            result = self.answer(lit, snapshot)
+            if after_version is None:
+                if result is not None:
+                    return result, snapshot, False
+            elif snapshot.changed_since(pattern, after_version):
+                return result, snapshot, False
+            try:
+                snapshot = await asyncio.wait_for(
+                    self.next_snapshot(snapshot.version), deadline - loop.time()
+                )
+            except asyncio.TimeoutError:
+                return result, snapshot, True
+
+    def extract_from_beliefs(
+        self, pattern: agentspeak.Literal, snapshot: BeliefSnapshot
+    ) -> list:
+        """The beliefs which match the pattern (without their annotations), sorted."""
+        r = snapshot.query(pattern)
+        return sorted(
+            (agentspeak.Literal(b.functor, b.args) for b in r), key=lambda b: str(b)
+        )
+
+    def get_belief(self, s: str, snapshot: BeliefSnapshot | None = None) -> str | None:
+        """Answer to an ask request: the matching beliefs, one per line,
+        or only their value for a functor whose beliefs have one argument.
+        Return None if no belief matches.
+        The beliefs are read in the given snapshot, or in the last one.
+        """
+        return self.answer(frozen_lit_of_str(s), snapshot)
+
+    def answer(
+        self, lit: agentspeak.Literal, snapshot: BeliefSnapshot | None = None
+    ) -> str | None:
+        """Like get_belief, for a literal."""
+        if snapshot is None:
+            snapshot = self.snapshot
+        pattern = self.ask_pattern(lit)
+        r = self.extract_from_beliefs(pattern, snapshot)
+        if not r:
             return None
+        elif lit.args or len(pattern.args) != 1:
+            return "\n".join(str(b) for b in r)
+        else:
+            return "\n".join(str(b.args[0]) for b in r)
+
+    async def answer_all(
+        self, lits: list[agentspeak.Literal], output_event_queue: EventQueue
+    ):
+        """Answer to several asked literals with one reply, one part per literal
+        (empty if no belief matches), all read in the same snapshot.
+        """
+        snapshot = self.snapshot
+        answers = [self.answer(l, snapshot) for l in lits]
+        await reply_parts(
+            output_event_queue,
+            ["" if a is None else a for a in answers],
+            metadata={"snapshot_version": snapshot.version},
+        )
 
     async def preprocess_message(
-        self, m: AgentSpeakMessage, output_event_queue: EventQueue
+        self,
+        m: AgentSpeakMessage,
+        output_event_queue: EventQueue,
+        backpressure: bool = True,
     ):
         """Answer to a message depending on the nature of a message:
         - reply with the required information for ask illocutions
         - reply with an ackowledgement and process the request otherwise.
+        With backpressure, a request is processed only when the outbox has room.
         """
         if m.illocution == "achieve":
             await reply(output_event_queue, "Achieve received")
+            if backpressure:
+                await self.outbox.wait_for_room()
             self.process_message(m)
 
         elif m.illocution == "tell":
             await reply(output_event_queue, "Tell received.")
+            if backpressure:
+                await self.outbox.wait_for_room()
             self.process_message(m)
 
+        elif m.illocution == "untell":
+            await reply(output_event_queue, "Untell received.")
+            if backpressure:
+                await self.outbox.wait_for_room()
+            self.process_message(m)
+
+        elif m.illocution == "subscribe" or m.illocution == "unsubscribe":
+            functor = frozen_lit_of_str(m.content).functor
+            if self.public_functors is not None and functor not in self.public_functors:
+                await reply(
+                    output_event_queue,
+                    "The belief " + functor + " cannot be asked in this agent.",
+                )
+            elif not m.sender.startswith("http"):
+                await reply(
+                    output_event_queue,
+                    "A subscription needs a push notification URL.",
+                )
+            elif m.illocution == "subscribe":
+                await reply(output_event_queue, "Subscribe received.")
+                self.subscribe(m.sender, functor)
+            else:
+                await reply(output_event_queue, "Unsubscribe received.")
+                self.unsubscribe(m.sender, functor)
+
         elif (
             m.illocution == "ask"
         ):  # fixme : also check that the requested belief is public.
             """in A2A, each received message has an event queue to post responses.
             This is not the case in AgentSpeak.
             Here we add an illocution for requests that need an answer : ask"""
-            result = self.get_belief(m.content)
+            lits = ask_literals(m.content)
+            if len(lits) != 1 or m.content.lstrip().startswith("["):
+                # batch ask
+                await self.answer_all(lits, output_event_queue)
+                return
+            if "after_version" in m.options or "timeout" in m.options:
+                # long-poll ask: one reply, when the beliefs change or on timeout
+                try:
+                    after_version, timeout = self.poll_options(m.options)
+                except ValueError as e:
+                    await reply(output_event_queue, str(e))
+                    return
+                result, snapshot, timed_out = await self.wait_and_answer(
+                    lits[0], after_version, timeout
+                )
+                await reply(
+                    output_event_queue,
+                    "" if result is None else result,
+                    metadata={
+                        "snapshot_version": snapshot.version,
+                        "timed_out": timed_out,
+                    },
+                )
+                return
+            snapshot = self.snapshot  # no lock: snapshots are immutable
+            result = self.answer(lits[0], snapshot)
             if result is not None:
-                await reply(output_event_queue, result)
+                await reply(
+                    output_event_queue,
+                    result,
+                    metadata={"snapshot_version": snapshot.version},
+                )
             else:
                 pass  # do not reply
         else:
             print("Cannot manage illocution " + m.illocution)
 
+    async def preprocess_messages(
+        self,
+        msgs: list[AgentSpeakMessage],
+        output_event_queue: EventQueue,
+        backpressure: bool = True,
+    ):
+        """Answer to a multi-part message: one reply with the acknowledgement of each part,
+        then the parts are processed all together (achieve, tell, untell: all of them or none,
+        see post_messages), or one reply with the answers to all the parts (ask only, see answer_all).
+        """
+        if all(m.illocution == "ask" for m in msgs):
+            lits = [l for m in msgs for l in ask_literals(m.content)]
+            await self.answer_all(lits, output_event_queue)
+            return
+        elif any(m.illocution == "ask" for m in msgs):
+            await reply(
+                output_event_queue,
+                "Cannot mix ask with other illocutions in a multi-part message.",
+            )
+            return
+        acks = {
+            "achieve": "Achieve received",
+            "tell": "Tell received.",
+            "untell": "Untell received.",
+        }
+        for m in msgs:
+            if m.illocution not in acks:
+                await reply(
+                    output_event_queue,
+                    "Cannot manage illocution "
+                    + m.illocution
+                    + " in a multi-part message.",
+                )
+                return
+            if m.illocution == "achieve" and not self.has_plan(m):
+                # checked before the acknowledgement (see post_messages)
+                await reply(
+                    output_event_queue,
+                    "No plan to achieve " + m.content + " in this agent.",
+                )
+                return
+        await reply(output_event_queue, "\n".join(acks[m.illocution] for m in msgs))
+        if backpressure:
+            await self.outbox.wait_for_room()
+        self.process_messages(msgs)
+
 
 class BDIAgentExecutor(AgentExecutor):
 
@@ -187,8 +867,12 @@ class BDIAgentExecutor(AgentExecutor):
         public_literals: list[str],
         url: str,
         additional_tools,
+        pool: ConnectionPool | None = None,
+        **agent_options,
     ):
-        self.bdi_agent = BDIAgent(asl_file, url, additional_tools=additional_tools)
+        self.bdi_agent = BDIAgent(
+            asl_file, url, additional_tools=additional_tools, pool=pool, **agent_options
+        )
         self.public_literals = public_literals
 
     def is_public(self, lit: str) -> bool:
@@ -199,15 +883,88 @@ class BDIAgentExecutor(AgentExecutor):
         context: RequestContext,
         output_event_queue: EventQueue,
     ) -> None:
-        m: AgentSpeakMessage = asl_of_a2a(context)
-        l = str(m.literal().functor)
-        if not (self.is_public(l)):
+        self.bdi_agent.scheduler.bind_loop(asyncio.get_running_loop())
+        self.bdi_agent.scheduler.start()
+        msgs = asl_list_of_a2a(context)
+        if not msgs:
             await reply(
                 output_event_queue,
-                "The literal " + l + " is not public it this agent.",
+                "No AgentSpeak message (text part with an illocution) in this message.",
             )
+        elif len(msgs) == 1:
+            await self.handle(msgs[0], output_event_queue)
+        else:
+            await self.handle_all(msgs, output_event_queue)
+
+    def functors(self, m: AgentSpeakMessage) -> list[str]:
+        if m.illocution == "ask":
+            return [str(l.functor) for l in ask_literals(m.content)]
         else:
-            await self.bdi_agent.preprocess_message(m, output_event_queue)
+            return [str(m.literal().functor)]
+
+    async def check_public(
+        self, msgs: list[AgentSpeakMessage], output_event_queue: EventQueue
+    ) -> bool:
+        for m in msgs:
+            for l in self.functors(m):
+                if not (self.is_public(l)):
+                    await reply(
+                        output_event_queue,
+                        "The literal " + l + " is not public it this agent.",
+                    )
+                    return False
+        return True
+
+    async def handle(
+        self,
+        m: AgentSpeakMessage,
+        output_event_queue: EventQueue,
+        backpressure: bool = True,
+    ):
+        if await self.check_public([m], output_event_queue):
+            await self.bdi_agent.preprocess_message(m, output_event_queue, backpressure)
+
+    async def handle_all(
+        self,
+        msgs: list[AgentSpeakMessage],
+        output_event_queue: EventQueue,
+        backpressure: bool = True,
+    ):
+        """Handle the parts of a multi-part message: all of them or none."""
+        if await self.check_public(msgs, output_event_queue):
+            await self.bdi_agent.preprocess_messages(
+                msgs, output_event_queue, backpressure
+            )
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         raise Exception("cancel not supported")
+
+    async def receive_local(self, msgs: list[AgentSpeakMessage]) -> str:
+        """Handle a message (or the parts of a multi-part message) sent by an agent
+        of this process, return the reply.
+        There is no backpressure: the caller is an outbox worker, and the outbox of this agent
+        may only get room from that worker (or from the workers waiting for its own outbox).
+        """
+        if self.bdi_agent.scheduler.stopped:
+            raise RuntimeError("The agent at " + self.bdi_agent.my_url + " is stopped.")
+        r = LocalReply()
+        if len(msgs) == 1:
+            h = self.handle(msgs[0], r, backpressure=False)
+        else:
+            h = self.handle_all(msgs, r, backpressure=False)
+        loop = self.bdi_agent.scheduler.loop
+        if loop is None or loop is asyncio.get_running_loop():
+            await h
+        else:
+            # that agent is served by another event loop of this process
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(h, loop))
+        return r.text()
+
+    async def startup(self):
+        await self.bdi_agent.startup()
+        local_agents[local_key(self.bdi_agent.my_url)] = self
+
+    async def shutdown(self):
+        if local_agents.get(local_key(self.bdi_agent.my_url)) is self:
+            del local_agents[local_key(self.bdi_agent.my_url)]
+        await self.bdi_agent.shutdown()
@@ -0,0 +1,215 @@
+from dataclasses import dataclass, field
+
+import agentspeak
+import agentspeak.runtime
+from agentspeak.runtime import AslError
+
+# index key of the beliefs whose first argument cannot be hashed
+_UNHASHABLE = object()
+
+
+def first_arg_key(term: agentspeak.Literal):
+    """Index key of a ground literal: its first argument (None if it has no argument)."""
+    if not term.args:
+        return None
+    k = term.args[0]
+    try:
+        hash(k)
+    except TypeError:
+        return _UNHASHABLE
+    return k
+
+
+def matches(
+    index: dict[object, frozenset] | dict[object, set], pattern: agentspeak.Literal
+) -> list[agentspeak.Literal]:
+    """The beliefs of an index (of one group) which unify with the pattern (annotations are ignored)."""
+    if pattern.args and agentspeak.is_ground(pattern.args[0], {}):
+        key = first_arg_key(pattern)
+        candidates = list(index.get(key, ()))
+        if key is not _UNHASHABLE:
+            candidates.extend(index.get(_UNHASHABLE, ()))
+    else:
+        candidates = [b for bucket in index.values() for b in bucket]
+    return [b for b in candidates if agentspeak.unifies(pattern, b)]
+
+
+@dataclass(frozen=True)
+class BeliefSnapshot:
+    """An immutable copy of (some of) the beliefs of an agent, indexed like in IndexedAgent.
+    The groups which did not change are shared with the previous snapshot.
+    """
+
+    version: int = 0
+    groups: dict[tuple[str, int], dict[object, frozenset]] = field(default_factory=dict)
+    # version of the last change of each group
+    changed_at: dict[tuple[str, int], int] = field(default_factory=dict)
+
+    def query(self, pattern: agentspeak.Literal) -> list[agentspeak.Literal]:
+        return matches(self.groups.get(pattern.literal_group(), {}), pattern)
+
+    def values(self, group: tuple[str, int]) -> set[agentspeak.Literal]:
+        """The beliefs of a group, without their annotations."""
+        return {
+            agentspeak.Literal(b.functor, b.args)
+            for bucket in self.groups.get(group, {}).values()
+            for b in bucket
+        }
+
+    def changed_since(self, pattern: agentspeak.Literal, version: int) -> bool:
+        """Whether the beliefs with the functor and arity of the pattern changed after that version."""
+        return self.changed_at.get(pattern.literal_group(), 0) > version
+
+
+class IndexedAgent(agentspeak.runtime.Agent):
+    """An agentspeak agent whose beliefs are also indexed on their first argument.
+
+    Removals (-b and .abolish) whose first argument is ground only consider the
+    beliefs with that first argument, instead of all the beliefs with the same
+    functor and arity. The index is also what the snapshots (read by ask requests)
+    are built from. The queries of plans (contexts, ?b) still scan agent.beliefs.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (functor, arity) -> first argument -> beliefs
+        self.index: dict[tuple[str, int], dict[object, set]] = {}
+        # (group, first argument) changed since the last snapshot
+        self.changed: set[tuple[tuple[str, int], object]] = set()
+        for beliefs in self.beliefs.values():
+            for belief in beliefs:
+                self.index_belief(belief)
+
+    def index_belief(self, belief: agentspeak.Literal):
+        group = self.index.setdefault(belief.literal_group(), {})
+        key = first_arg_key(belief)
+        group.setdefault(key, set()).add(belief)
+        self.changed.add((belief.literal_group(), key))
+
+    def unindex_belief(self, belief: agentspeak.Literal):
+        group = self.index.get(belief.literal_group(), {})
+        key = first_arg_key(belief)
+        self.changed.add((belief.literal_group(), key))
+        bucket = group.get(key)
+        if bucket is not None:
+            bucket.discard(belief)
+            if not bucket:
+                del group[key]
+
+    def candidates(self, term: agentspeak.Literal):
+        """The beliefs which may unify with the term."""
+        group = term.literal_group()
+        if term.args and agentspeak.is_ground(term.args[0], {}):
+            index = self.index.get(group, {})
+            key = first_arg_key(term)
+            if key is _UNHASHABLE:
+                return index.get(_UNHASHABLE, set())
+            return index.get(key, set()) | index.get(_UNHASHABLE, set())
+        return self.beliefs[group]
+
+    def add_belief(self, term, scope):
+        term = term.grounded(scope)
+
+        if term.functor is None:
+            raise AslError("expected belief literal")
+
+        self.beliefs[(term.functor, len(term.args))].add(term)
+        self.index_belief(term)
+
+    def remove_belief(self, term, intention):
+        term = agentspeak.evaluate(term, intention.scope)
+
+        try:
+            group = term.literal_group()
+        except AttributeError:
+            raise AslError("expected belief literal, got: '%s'" % term)
+
+        choicepoint = object()
+
+        for belief in list(self.candidates(term)):
+            intention.stack.append(choicepoint)
+            if agentspeak.unifies_annotated(
+                term, belief, intention.scope, intention.stack
+            ):
+                self.beliefs[group].remove(belief)
+                self.unindex_belief(belief)
+                return True
+            agentspeak.reroll(intention.scope, intention.stack, choicepoint)
+
+        return False
+
+    def abolish(self, pattern: agentspeak.Literal):
+        """Remove all the beliefs which unify with the pattern (with annotations), like .abolish."""
+        group = self.beliefs[pattern.literal_group()]
+        for belief in list(self.candidates(pattern)):
+            if agentspeak.unifies_annotated(belief, pattern):
+                group.remove(belief)
+                self.unindex_belief(belief)
+
+    def checkpoint(self, groups: set[tuple[str, int]]) -> tuple:
+        """The state changed by posting events (call) whose beliefs are in the given groups (see rollback)."""
+        beliefs = {g: set(self.beliefs[g]) for g in groups}
+        waiters = [
+            (stack[-1], stack[-1].waiter)
+            for stack in self.intentions
+            if stack and stack[-1].waiter is not None
+        ]
+        return beliefs, len(self.intentions), waiters
+
+    def rollback(self, checkpoint: tuple):
+        """Undo the events posted since the checkpoint: their changes of beliefs,
+        the intentions they started and the waiting intentions they woke up.
+        """
+        beliefs, nb_intentions, waiters = checkpoint
+        for g, saved in beliefs.items():
+            group = self.beliefs[g]
+            for belief in list(group - saved):
+                group.remove(belief)
+                self.unindex_belief(belief)
+            for belief in saved - group:
+                group.add(belief)
+                self.index_belief(belief)
+        while len(self.intentions) > nb_intentions:
+            self.intentions.pop()
+        for intention, waiter in waiters:
+            intention.waiter = waiter
+
+    def snapshot(
+        self, previous: BeliefSnapshot, functors: set[str] | None = None
+    ) -> BeliefSnapshot:
+        """A snapshot of the beliefs with the given functors (all if None), copying only
+        what changed since the previous snapshot. Return the previous one if nothing changed.
+        """
+        changed = [
+            (g, k) for (g, k) in self.changed if functors is None or g[0] in functors
+        ]
+        self.changed.clear()
+        if not changed:
+            return previous
+        groups = dict(previous.groups)
+        copied = set()
+        for g, k in changed:
+            if g not in copied:
+                groups[g] = dict(groups.get(g, {}))
+                copied.add(g)
+            bucket = self.index.get(g, {}).get(k)
+            if bucket:
+                groups[g][k] = frozenset(bucket)
+            else:
+                groups[g].pop(k, None)
+        version = previous.version + 1
+        changed_at = dict(previous.changed_at)
+        for g in copied:
+            changed_at[g] = version
+        return BeliefSnapshot(version, groups, changed_at)
+
+
+def add_index_actions(actions: agentspeak.Actions):
+    """Override the stdlib actions which change the beliefs of an IndexedAgent
+    without add_belief or remove_belief (they would leave the index stale).
+    """
+
+    @actions.add(".abolish", 1)
+    def _abolish(agent, term, intention):
+        agent.abolish(agentspeak.freeze(term.args[0], intention.scope, {}))
+        yield
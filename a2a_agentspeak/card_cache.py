@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+import httpx
+from a2a.client import A2AClientHTTPError, A2AClientJSONError
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from pydantic import ValidationError
+
+
+def card_url(url: str) -> str:
+    return url.rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH
+
+
+def max_age(response: httpx.Response) -> float | None:
+    """The freshness lifetime given by the Cache-Control header, if any."""
+    for directive in response.headers.get("cache-control", "").split(","):
+        directive = directive.strip()
+        if directive == "no-cache":
+            return 0.0
+        if directive.startswith("max-age="):
+            try:
+                return float(directive.removeprefix("max-age="))
+            except ValueError:
+                return None
+    return None
+
+
+@dataclass
+class CacheEntry:
+    card: AgentCard
+    expires: float
+    etag: str | None
+    last_modified: str | None
+
+
+class CardCache:
+    """Agent cards indexed by agent URL.
+
+    A card is reused without any request until its TTL expires (the max-age sent
+    by the server takes precedence over the default TTL). A stale card is then
+    refreshed with a conditional request, so that an unchanged card is not
+    downloaded again.
+    """
+
+    entries: dict[str, CacheEntry]
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.entries = {}
+        # concurrent misses for the same URL (and event loop) share one request
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def lookup(self, url: str) -> AgentCard | None:
+        """The card of that agent if it is in the cache and fresh, None otherwise."""
+        e = self.entries.get(url)
+        if e is not None and e.expires > time.monotonic():
+            self.hits += 1
+            return e.card
+        else:
+            return None
+
+    def invalidate(self, url: str):
+        self.entries.pop(url, None)
+
+    async def get(self, url: str, httpx_client: httpx.AsyncClient) -> AgentCard:
+        """The card of that agent, fetched with the given client if it is not fresh in the cache."""
+        card = self.lookup(url)
+        if card is not None:
+            return card
+
+        key = (url, asyncio.get_running_loop())
+        task = self.pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self.refresh(url, httpx_client))
+            self.pending[key] = task
+            task.add_done_callback(lambda t: self.done(key, t))
+        return await asyncio.shield(task)
+
+    def done(self, key, task: asyncio.Task):
+        self.pending.pop(key, None)
+        # the callers may have given up waiting (timeout): the error must not be reported as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    async def refresh(self, url: str, httpx_client: httpx.AsyncClient) -> AgentCard:
+        target_url = card_url(url)
+        entry = self.entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = await httpx_client.get(target_url, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                self.revalidations += 1
+                entry.expires = self.expiry(response)
+                return entry.card
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(
+                e.response.status_code,
+                f"Failed to fetch agent card from {target_url}: {e}",
+            ) from e
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(
+                503,
+                f"Network communication error fetching agent card from {target_url}: {e}",
+            ) from e
+        except (json.JSONDecodeError, ValidationError) as e:
+            raise A2AClientJSONError(
+                f"Failed to read agent card from {target_url}: {e}"
+            ) from e
+
+        self.entries[url] = CacheEntry(
+            card=card,
+            expires=self.expiry(response),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        return card
+
+    def expiry(self, response: httpx.Response) -> float:
+        a = max_age(response)
+        return time.monotonic() + (self.ttl if a is None else a)
+
+
+# shared by the clients (a2a_utils.card_holder) and by the agents
+# (bdi.do_send drops the cards of the destinations which fail)
+default_card_cache = CardCache()
@@ -1,37 +1,125 @@
 import agentspeak
 
 
-def check_achievement(literal: str, ast: agentspeak.parser.AstAgent) -> bool:
+class TriggerIndex:
+    """The plan triggers and the initial beliefs of an AST, indexed in one pass.
+
+    plans: (goal type, trigger, functor) -> arities of the plans with that trigger.
+    beliefs: functor -> arities of the initial beliefs.
+    """
+
+    def __init__(self, ast: agentspeak.parser.AstAgent):
+        self.plans: dict[
+            tuple[agentspeak.GoalType, agentspeak.Trigger, str], set[int]
+        ] = {}
+        self.beliefs: dict[str, set[int]] = {}
+        for p in ast.plans:
+            e = p.event
+            key = (e.goal_type, e.trigger, e.head.functor)
+            self.plans.setdefault(key, set()).add(len(e.head.terms))
+        for b in ast.beliefs:
+            self.beliefs.setdefault(b.functor, set()).add(len(b.terms))
+
+    def plan_arities(
+        self,
+        goal_type: agentspeak.GoalType,
+        functor: str,
+        trigger: agentspeak.Trigger | None = agentspeak.Trigger.addition,
+    ) -> set[int]:
+        """The arities of the plans triggered by that event on that goal or belief
+        (the addition by default, any event if trigger is None).
+        """
+        if trigger is not None:
+            return self.plans.get((goal_type, trigger, functor), set())
+        return set().union(
+            *(
+                self.plans.get((goal_type, t, functor), set())
+                for t in agentspeak.Trigger
+            )
+        )
+
+    def belief_arities(self, functor: str) -> set[int]:
+        return self.beliefs.get(functor, set())
+
+
+def check_achievement(
+    literal: str, ast: agentspeak.parser.AstAgent, index: TriggerIndex | None = None
+) -> bool:
     """The literal occurs as trigger in a plan."""
-    # exists
-    for p in ast.plans:
-        if (
-            p.event.goal_type == agentspeak.GoalType.achievement
-            and p.event.head.functor == literal
-        ):
-            return True
-    return False
+    index = TriggerIndex(ast) if index is None else index
+    return bool(index.plan_arities(agentspeak.GoalType.achievement, literal, None))
 
 
-def check_input_belief(literal: str, ast: agentspeak.parser.AstAgent) -> bool:
+def check_input_belief(
+    literal: str, ast: agentspeak.parser.AstAgent, index: TriggerIndex | None = None
+) -> bool:
     """The literal occurs as trigger in a plan."""
-    # exists
-    for p in ast.plans:
-        if (
-            p.event.goal_type == agentspeak.GoalType.belief
-            and p.event.head.functor == literal
-        ):
-            return True
-    return False
+    index = TriggerIndex(ast) if index is None else index
+    return bool(index.plan_arities(agentspeak.GoalType.belief, literal, None))
 
 
-def check_ask_belief(literal: str, ast: agentspeak.parser.AstAgent) -> bool:
+def check_ask_belief(
+    literal: str, ast: agentspeak.parser.AstAgent, index: TriggerIndex | None = None
+) -> bool:
     """The literal occurs in a belief."""
-    # exists
-    for b in ast.beliefs:
-        if b.functor == literal:
-            return True
-    return False
+    index = TriggerIndex(ast) if index is None else index
+    return bool(index.belief_arities(literal))
+
+
+def asked_arity(declared: int, found: set[int]) -> int:
+    """The arity of the beliefs read by an ask skill, given the arities of the initial beliefs.
+    An ask skill of arity 0 for a belief of arity 1 (secret : 0 for secret(X)) reads the values
+    of that belief, as the ask requests did before the arities were used.
+    """
+    if declared == 0 and 0 not in found and 1 in found:
+        return 1
+    return declared
+
+
+# illocution -> (kind of skill, what implements it)
+CHECKED_ILLOCUTIONS = {
+    "achieve": ("action", "plan +!"),
+    "tell": ("input", "plan +"),
+    "ask": ("belief", "initial belief "),
+}
+
+
+def check_skill(
+    illocution: str, literal: str, arity: int, index: TriggerIndex
+) -> str | None:
+    """The mismatch between a skill of the interface (with an illocution of CHECKED_ILLOCUTIONS)
+    and the implementation, None if there is none.
+    Unlike check_achievement and check_input_belief, only the addition plans (+!g, +b) implement
+    an action or an input: they handle the events of the achieve and tell messages.
+    """
+    if illocution == "achieve":
+        found = index.plan_arities(agentspeak.GoalType.achievement, literal)
+    elif illocution == "tell":
+        found = index.plan_arities(agentspeak.GoalType.belief, literal)
+    else:
+        found = index.belief_arities(literal)
+    kind, where = CHECKED_ILLOCUTIONS[illocution]
+    if not found:
+        return kind + " " + literal + "/" + str(arity) + ": no " + where + literal
+    if illocution == "ask":
+        matched = asked_arity(arity, found) in found
+    else:
+        matched = arity in found
+    if not matched:
+        return (
+            kind
+            + " "
+            + literal
+            + "/"
+            + str(arity)
+            + ": arity mismatch with "
+            + where
+            + literal
+            + " (arity "
+            + ", ".join(str(a) for a in sorted(found))
+            + ")"
+        )
+    return None
 
 
 tell_illoc = agentspeak.Literal("tell")
@@ -0,0 +1,91 @@
+import importlib.util
+
+import httpx
+
+
+def peer_of(url: str) -> str:
+    """The part of an URL that identifies a peer: scheme, host and port."""
+    u = httpx.URL(url)
+    if u.port is None:
+        return u.scheme + "://" + u.host
+    else:
+        return u.scheme + "://" + u.host + ":" + str(u.port)
+
+
+LOOPBACK_HOSTS = ["localhost", "127.0.0.1", "0.0.0.0", "::1"]
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def local_key(url: str) -> str:
+    """Normalized URL of an agent (loopback host aliases are identified)."""
+    u = httpx.URL(url)
+    host = "127.0.0.1" if u.host in LOOPBACK_HOSTS else u.host
+    port = u.port if u.port is not None else DEFAULT_PORTS.get(u.scheme, 0)
+    return u.scheme + "://" + host + ":" + str(port) + u.path.rstrip("/")
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class ConnectionPool:
+    """Long-lived HTTP clients used by an agent to send messages to its peers.
+
+    One httpx client is kept per peer, so that successive messages to the same
+    peer reuse kept-alive connections instead of opening a new one each time.
+    The limits apply to each peer.
+    Some agents can be reached through a Unix domain socket instead of TCP (see route).
+    """
+
+    clients: dict[str, httpx.AsyncClient]
+    uds_routes: dict[str, str]
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 5.0,
+        http2: bool = False,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        if http2 and not http2_available():
+            print(
+                "Warning: HTTP/2 requested but package h2 is not installed, using HTTP/1.1."
+            )
+            http2 = False
+        self.http2 = http2
+        self.clients = {}
+        self.uds_routes = {}
+
+    def route(self, agent_url: str, uds: str):
+        """Reach the agent at that URL through the given Unix domain socket."""
+        self.uds_routes[local_key(agent_url)] = uds
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        uds = self.uds_routes.get(local_key(url)) if self.uds_routes else None
+        key = peer_of(url) if uds is None else "unix:" + uds
+        c = self.clients.get(key)
+        if c is None or c.is_closed:
+            if uds is None:
+                c = httpx.AsyncClient(
+                    limits=self.limits, timeout=self.timeout, http2=self.http2
+                )
+            else:
+                c = httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(uds=uds, limits=self.limits),
+                    timeout=self.timeout,
+                )
+            self.clients[key] = c
+        return c
+
+    async def aclose(self):
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for c in clients:
+            await c.aclose()
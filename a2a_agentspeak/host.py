@@ -0,0 +1,76 @@
+import contextlib
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from a2a_agentspeak.asp_build import AgentSpeakInterface, from_file
+from a2a_agentspeak.connection_pool import ConnectionPool
+from a2a_agentspeak.scheduler import Scheduler
+from a2a_agentspeak.server import AgentSpeakServer
+
+
+def normalize_prefix(prefix: str) -> str:
+    return "/" + prefix.strip("/")
+
+
+class AgentHost:
+    """Several AgentSpeak agents served by one Starlette application (one process, one port).
+
+    Each agent is mounted under its own path prefix: its URL is base_url/prefix/
+    and its agent card is at the well-known path under that URL.
+    The agents share one agentspeak Environment (driven by one scheduler) and one connection pool.
+    """
+
+    servers: dict[str, AgentSpeakServer]
+
+    def __init__(
+        self,
+        base_url: str,
+        pool: ConnectionPool | None = None,
+        mode: str = "inline",
+        batch_size: int = 32,
+        max_linger: float = 0.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool = ConnectionPool() if pool is None else pool
+        self.scheduler = Scheduler(
+            mode=mode, batch_size=batch_size, max_linger=max_linger
+        )
+        self.servers = {}
+
+    def url_of(self, prefix: str) -> str:
+        return self.base_url + normalize_prefix(prefix) + "/"
+
+    def add(
+        self, prefix: str, intf: str, impl: str, tools=frozenset(), **agent_options
+    ) -> AgentSpeakInterface:
+        """Load an agent (see asp_build.from_file) and mount it under the given prefix."""
+        a = from_file(intf, impl, self.url_of(prefix), tools)
+        self.mount(prefix, a, **agent_options)
+        return a
+
+    def mount(self, prefix: str, a: AgentSpeakInterface, **agent_options):
+        p = normalize_prefix(prefix)
+        if p in self.servers:
+            raise ValueError("An agent is already mounted at " + p)
+        if a.url != self.url_of(prefix):
+            raise ValueError("The URL of the agent must be " + self.url_of(prefix))
+        self.servers[p] = a.build_server(
+            pool=self.pool, scheduler=self.scheduler, **agent_options
+        )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        # (the lifespans of mounted applications are not run by Starlette)
+        for server in self.servers.values():
+            await server.executor.startup()
+        yield
+        # the outboxes are drained first: their loopback deliveries still need the scheduler
+        for server in self.servers.values():
+            await server.executor.shutdown()
+        await self.scheduler.stop()
+        await self.pool.aclose()
+
+    def build(self, **kwargs) -> Starlette:
+        routes = [Mount(p, app=server.build()) for p, server in self.servers.items()]
+        return Starlette(routes=routes, lifespan=self.lifespan, **kwargs)
@@ -1,4 +1,3 @@
-from a2a.server.agent_execution import RequestContext
 from a2a.types import (
     SendMessageRequest,
     MessageSendParams,
@@ -7,13 +6,20 @@ from a2a.types import (
     Message,
     MessageSendConfiguration,
     PushNotificationConfig,
+    TextPart,
 )
 
-from typing import Any
+import functools
+import json
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 from a2a_agentspeak.asl_message import AgentSpeakMessage
 
+# clients use this module without the a2a server stack
+if TYPE_CHECKING:
+    from a2a.server.agent_execution import RequestContext
+
 
 def extract_text(response: SendMessageResponse):
     """Extract text from synchronous replies"""
@@ -27,33 +33,163 @@ def extract_text(response: SendMessageResponse):
         return response.model_dump(mode="json", exclude_none=True)
 
 
+def extract_texts(response: SendMessageResponse) -> list[str]:
+    """Extract the text of all the parts of a synchronous reply (see batch ask)"""
+    if (
+        isinstance(response, SendMessageResponse)
+        and isinstance(response.root, SendMessageSuccessResponse)
+        and isinstance(response.root.result, Message)
+    ):
+        return [p.root.text for p in response.root.result.parts]
+    else:
+        return [str(response.model_dump(mode="json", exclude_none=True))]
+
+
 def build_basic_message(
-    illoc: str, t: str, c: MessageSendConfiguration
+    illoc: str, t: str, c: MessageSendConfiguration, options: dict | None = None
+) -> dict[str, Any]:
+    metadata = {"illocution": illoc}
+    if options:
+        metadata.update(options)
+    return {
+        "message": {
+            "role": "user",
+            "parts": [{"kind": "text", "metadata": metadata, "text": t}],
+            "messageId": uuid4().hex,
+        },
+        "configuration": c,
+    }
+
+
+def build_multipart_message(
+    messages: list[tuple[str, str]], c: MessageSendConfiguration
 ) -> dict[str, Any]:
+    """One A2A message carrying several (illocution, content) pairs, one per part."""
     return {
         "message": {
             "role": "user",
-            "parts": [{"kind": "text", "metadata": {"illocution": illoc}, "text": t}],
+            "parts": [
+                {"kind": "text", "metadata": {"illocution": illoc}, "text": t}
+                for illoc, t in messages
+            ],
             "messageId": uuid4().hex,
         },
         "configuration": c,
     }
 
 
-def build_basic_request(illoc: str, t: str, reply_to_url: str) -> SendMessageRequest:
-    c = MessageSendConfiguration(
+def configuration_of(reply_to_url: str) -> MessageSendConfiguration:
+    """The configuration of a message of that sender.
+    A new one for each message: the models are mutable (encode_basic_request uses a cached JSON form instead).
+    """
+    return MessageSendConfiguration(
         push_notification_config=PushNotificationConfig(url=reply_to_url)
     )
-    params = MessageSendParams(**build_basic_message(illoc, t, c))
+
+
+def build_basic_request(
+    illoc: str, t: str, reply_to_url: str, options: dict | None = None
+) -> SendMessageRequest:
+    """options are added to the metadata of the message, for instance
+    {"after_version": 3, "timeout": 30} for a long-poll ask (see BDIAgent.wait_and_answer).
+    """
+    c = configuration_of(reply_to_url)
+    params = MessageSendParams(**build_basic_message(illoc, t, c, options))
     return SendMessageRequest(id=str(uuid4()), params=params)
 
 
-def asl_of_a2a(context: RequestContext) -> AgentSpeakMessage:
+def build_multipart_request(
+    messages: list[tuple[str, str]], reply_to_url: str
+) -> SendMessageRequest:
+    c = configuration_of(reply_to_url)
+    params = MessageSendParams(**build_multipart_message(messages, c))
+    return SendMessageRequest(id=str(uuid4()), params=params)
+
+
+@functools.lru_cache(maxsize=256)
+def _configuration_json(reply_to_url: str) -> str:
+    return json.dumps({"pushNotificationConfig": {"url": reply_to_url}})
+
+
+def encode_basic_request(illoc: str, t: str, reply_to_url: str) -> bytes:
+    """The JSON-RPC request of build_basic_request, directly as bytes.
+    No validation: the illocution and the content are known to be strings.
+    """
+    return encode_multipart_request([(illoc, t)], reply_to_url)
+
+
+def encode_multipart_request(
+    messages: list[tuple[str, str]], reply_to_url: str
+) -> bytes:
+    """The JSON-RPC request of build_multipart_request, directly as bytes (see encode_basic_request)."""
+    i = uuid4().hex  # both the id of the request and the id of the message
+    return (
+        '{"id":"'
+        + i
+        + '","jsonrpc":"2.0","method":"message/send","params":{"configuration":'
+        + _configuration_json(reply_to_url)
+        + ',"message":{"kind":"message","messageId":"'
+        + i
+        + '","parts":['
+        + ",".join(
+            '{"kind":"text","metadata":{"illocution":'
+            + json.dumps(illoc)
+            + '},"text":'
+            + json.dumps(t)
+            + "}"
+            for illoc, t in messages
+        )
+        + '],"role":"user"}}}'
+    ).encode()
+
+
+def extract_text_of_json(response: dict[str, Any]) -> str:
+    """Like extract_text, for a JSON-RPC response which has not been validated."""
+    result = response.get("result")
+    if isinstance(result, dict) and result.get("kind") == "message":
+        return result["parts"][0]["text"]
+    else:
+        return str(response)
+
+
+def sender_of(context: "RequestContext") -> str:
     if context.configuration is None:
         sender = "no config"
     elif context.configuration.push_notification_config is None:
         sender = "no push config"
     else:
         sender = context.configuration.push_notification_config.url
-    i = context.message.parts[0].root.metadata["illocution"]
-    return AgentSpeakMessage(i, context.get_user_input(), sender)
+    return sender
+
+
+def options_of(metadata: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in metadata.items() if k != "illocution"}
+
+
+def asl_of_a2a(context: "RequestContext") -> AgentSpeakMessage:
+    metadata = context.message.parts[0].root.metadata
+    return AgentSpeakMessage(
+        metadata["illocution"],
+        context.get_user_input(),
+        sender_of(context),
+        options_of(metadata),
+    )
+
+
+def asl_list_of_a2a(context: "RequestContext") -> list[AgentSpeakMessage]:
+    """The AgentSpeak messages carried by the parts of an A2A message (in order).
+    The parts which are not text parts with an illocution in their metadata are ignored.
+    """
+    sender = sender_of(context)
+    return [
+        AgentSpeakMessage(
+            p.root.metadata["illocution"],
+            p.root.text,
+            sender,
+            options_of(p.root.metadata),
+        )
+        for p in context.message.parts
+        if isinstance(p.root, TextPart)
+        and p.root.metadata is not None
+        and "illocution" in p.root.metadata
+    ]
@@ -0,0 +1,140 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+
+@dataclass
+class OutgoingMessage:
+    to_url: str
+    illocution: str
+    content: str
+
+    def parts(self) -> list[tuple[str, str]]:
+        return [(self.illocution, self.content)]
+
+
+@dataclass
+class OutgoingBatch:
+    """Several (illocution, content) sent in one multi-part message."""
+
+    to_url: str
+    messages: list[tuple[str, str]]
+
+    def parts(self) -> list[tuple[str, str]]:
+        return self.messages
+
+
+class Outbox:
+    """Bounded queue of outgoing messages, sent by a fixed number of workers.
+
+    Messages can be queued before the event loop runs: the workers are started
+    with the server (or at the first message posted from the event loop).
+    """
+
+    def __init__(
+        self,
+        send: Callable[[OutgoingMessage | OutgoingBatch], Awaitable[bool]],
+        max_size: int = 100,
+        workers: int = 4,
+    ):
+        self.send = send
+        self.max_size = max_size
+        self.nb_workers = workers
+        self.queue: asyncio.Queue[OutgoingMessage | OutgoingBatch] = asyncio.Queue(
+            max_size
+        )
+        self.workers: list[asyncio.Task] = []
+        self.room = asyncio.Event()
+        self.closed = False
+
+        # metrics
+        self.max_depth = 0
+        self.sent = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        if not self.workers:
+            self.workers = [
+                asyncio.create_task(self.work()) for _ in range(self.nb_workers)
+            ]
+
+    def start_if_running(self):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.start()
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "capacity": self.max_size,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def offer(self, m: OutgoingMessage | OutgoingBatch) -> bool:
+        """Queue a message without waiting. Return False if the outbox is full or closed."""
+        if self.closed:
+            self.rejected += 1
+            return False
+        try:
+            self.queue.put_nowait(m)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.max_depth = max(self.max_depth, self.depth())
+        self.start_if_running()
+        return True
+
+    async def put(self, m: OutgoingMessage | OutgoingBatch):
+        """Queue a message, waiting for room if the outbox is full."""
+        if self.closed:
+            raise RuntimeError("Outbox closed.")
+        self.start()
+        await self.queue.put(m)
+        self.max_depth = max(self.max_depth, self.depth())
+
+    async def wait_for_room(self):
+        while self.queue.full():
+            self.room.clear()
+            await self.room.wait()
+
+    async def work(self):
+        while True:
+            m = await self.queue.get()
+            self.room.set()
+            try:
+                if await self.send(m):
+                    self.sent += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                print("---FAIL---: outbox worker failed to send. " + str(e))
+            finally:
+                self.queue.task_done()
+
+    async def close(self, timeout: float = 10.0):
+        """Stop accepting messages and send the pending ones (within the given time)."""
+        self.closed = True
+        if not self.queue.empty():
+            self.start()
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout)
+            except asyncio.TimeoutError:
+                print(
+                    "Warning: "
+                    + str(self.depth())
+                    + " message(s) not sent before shutdown."
+                )
+        for w in self.workers:
+            w.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
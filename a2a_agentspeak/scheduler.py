@@ -0,0 +1,277 @@
+import asyncio
+import collections
+import concurrent.futures
+import threading
+import time
+from typing import Callable
+
+import agentspeak.runtime
+
+MODES = ["inline", "mailbox", "thread"]
+
+_STOP = object()
+
+
+def _copy_outcome(src: concurrent.futures.Future, dst: concurrent.futures.Future):
+    if src.cancelled():
+        dst.cancel()
+    elif src.exception() is not None:
+        dst.set_exception(src.exception())
+    else:
+        dst.set_result(src.result())
+
+
+class Mailbox:
+    """Pending jobs of a scheduler, taken by batches.
+
+    A batch is taken as soon as a job is pending, after lingering at most
+    max_linger seconds for more jobs, and contains at most batch_size jobs.
+    Jobs can be put from any thread. The consumer is either a thread (get_batch)
+    or an asyncio task (get_batch_async).
+    """
+
+    def __init__(self, batch_size: int = 32, max_linger: float = 0.0):
+        if batch_size < 1:
+            raise ValueError("The size of batches must be positive.")
+        self.batch_size = batch_size
+        self.max_linger = max_linger
+        self.items = collections.deque()
+        self.cond = threading.Condition()
+        # asyncio consumer to wake up
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.event: asyncio.Event | None = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def put(self, item):
+        with self.cond:
+            self.items.append(item)
+            self.cond.notify()
+        if self.event is not None:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+    def take(self) -> list:
+        with self.cond:
+            n = min(self.batch_size, len(self.items))
+            return [self.items.popleft() for _ in range(n)]
+
+    def get_batch(self, timeout: float | None) -> list:
+        """Wait (at most timeout seconds, or forever if None) for a batch. Return [] if none."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.items, timeout):
+                return []
+            end = time.monotonic() + self.max_linger
+            while len(self.items) < self.batch_size:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            return self.take()
+
+    async def get_batch_async(self, timeout: float | None) -> list:
+        """Like get_batch, for a consumer which runs in an event loop."""
+        if self.event is None:
+            self.loop = asyncio.get_running_loop()
+            self.event = asyncio.Event()
+        self.event.clear()
+        if not self.items:
+            try:
+                await asyncio.wait_for(self.event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        end = self.loop.time() + self.max_linger
+        while len(self.items) < self.batch_size:
+            remaining = end - self.loop.time()
+            if remaining <= 0:
+                break
+            self.event.clear()
+            try:
+                await asyncio.wait_for(self.event.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return self.take()
+
+
+class Scheduler:
+    """Runs the reasoning cycles of the agents of an agentspeak Environment.
+
+    The jobs submitted to the scheduler (typically: post an event to an agent)
+    are followed by a reasoning cycle. Three modes are available:
+     * inline: each job and its reasoning cycle run immediately in the caller (env.run()).
+       A plan which waits (.wait) or calls a slow tool blocks the caller, which
+       is the asyncio event loop of the server.
+     * mailbox: jobs are queued in a mailbox and taken by batches by an asyncio task.
+       All the jobs of a batch are run, then one reasoning cycle for the whole batch.
+       Reasoning still occurs in the event loop, but waiting intentions do not block it.
+     * thread: the same mailbox, taken by a dedicated reasoning thread, so that the
+       event loop of the server stays responsive while the plans run.
+    batch_size and max_linger (seconds) tune the mailbox (see Mailbox).
+    """
+
+    def __init__(
+        self,
+        env: agentspeak.runtime.Environment | None = None,
+        mode: str = "inline",
+        batch_size: int = 32,
+        max_linger: float = 0.0,
+    ):
+        if mode not in MODES:
+            raise ValueError("Unknown scheduler mode: " + mode)
+        self.env = agentspeak.runtime.Environment() if env is None else env
+        self.mode = mode
+        # held during reasoning cycles, and while an agent is added to the environment
+        self.lock = threading.RLock()
+        self.mailbox = Mailbox(batch_size, max_linger)
+        self.thread: threading.Thread | None = None
+        self.task: asyncio.Task | None = None
+        # once stopped, the scheduler does not start again (jobs are refused)
+        self.stopped = False
+        # event loop of the server (used from the reasoning thread to reach asyncio objects)
+        self.loop: asyncio.AbstractEventLoop | None = None
+        # coroutines waiting for the event loop to be known
+        self.pending_coroutines = []
+        # guards loop and pending_coroutines (bind_loop and run_coroutine run in different threads)
+        self.loop_lock = threading.Lock()
+        # called after each reasoning cycle (in the reasoning context)
+        self.cycle_listeners: list[Callable[[], None]] = []
+
+        # metrics
+        self.cycles = 0
+        self.jobs = 0
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        with self.loop_lock:
+            if self.loop is not None:
+                return
+            self.loop = loop
+            pending, self.pending_coroutines = self.pending_coroutines, []
+        for coro, f in pending:
+            asyncio.run_coroutine_threadsafe(coro, loop).add_done_callback(
+                lambda g, f=f: _copy_outcome(g, f)
+            )
+
+    def run_coroutine(self, coro) -> concurrent.futures.Future:
+        """Run a coroutine in the event loop of the server (from any thread).
+        If that loop is not known yet, the coroutine starts when it becomes known.
+        """
+        with self.loop_lock:
+            loop = self.loop
+            if loop is None:
+                f = concurrent.futures.Future()
+                self.pending_coroutines.append((coro, f))
+                return f
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def add_cycle_listener(self, f: Callable[[], None]):
+        self.cycle_listeners.append(f)
+
+    def cycle_done(self):
+        for f in self.cycle_listeners:
+            try:
+                f()
+            except Exception as e:
+                print("---FAIL---: cycle listener failed. " + str(e))
+
+    def in_reasoning_thread(self) -> bool:
+        return self.thread is not None and threading.current_thread() is self.thread
+
+    def start(self):
+        """Start the consumer of the mailbox (in mailbox mode, must be called from the event loop)."""
+        if self.stopped:
+            return
+        if self.mode == "thread" and self.thread is None:
+            self.thread = threading.Thread(
+                target=self.reason, name="agentspeak-reasoning", daemon=True
+            )
+            self.thread.start()
+        elif self.mode == "mailbox" and self.task is None:
+            self.task = asyncio.create_task(self.reason_async())
+
+    def submit(self, job: Callable[[], None]):
+        """Run the job then a reasoning cycle. Raise RuntimeError if the scheduler is stopped."""
+        if self.stopped:
+            raise RuntimeError("The scheduler is stopped.")
+        if self.mode == "inline":
+            with self.lock:
+                try:
+                    job()
+                    self.env.run()
+                finally:
+                    self.cycle_done()
+        else:
+            if self.mode == "thread":
+                self.start()
+            self.mailbox.put(job)
+
+    def run_cycle(self) -> float | None:
+        """Step the agents until none of them can progress without waiting.
+        Return the next deadline of a waiting intention, if any.
+        """
+        self.cycles += 1
+        more_work = True
+        while more_work:
+            more_work = False
+            for agent in list(self.env.agents.values()):
+                if agent.step():
+                    more_work = True
+
+        deadlines = (agent.shortest_deadline() for agent in self.env.agents.values())
+        deadlines = [d for d in deadlines if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def run_batch(self, batch: list) -> tuple[bool, float | None]:
+        """Run the jobs of a batch then one reasoning cycle.
+        Return whether the scheduler must stop, and the next deadline.
+        """
+        stop = False
+        with self.lock:
+            for job in batch:
+                if job is _STOP:
+                    stop = True
+                else:
+                    self.jobs += 1
+                    try:
+                        job()
+                    except Exception as e:
+                        print("---FAIL---: job failed. " + str(e))
+            try:
+                return stop, self.run_cycle()
+            except Exception as e:
+                print("---FAIL---: reasoning cycle failed. " + str(e))
+                return stop, self.env.time()  # resume the other intentions
+            finally:
+                self.cycle_done()
+
+    def timeout(self, deadline: float | None) -> float | None:
+        return None if deadline is None else max(0.0, deadline - self.env.time())
+
+    def reason(self):
+        """Main loop of the reasoning thread."""
+        deadline = None
+        stop = False
+        while not stop:
+            batch = self.mailbox.get_batch(self.timeout(deadline))
+            stop, deadline = self.run_batch(batch)
+
+    async def reason_async(self):
+        """Main loop of the reasoning task (mailbox mode)."""
+        deadline = None
+        stop = False
+        while not stop:
+            batch = await self.mailbox.get_batch_async(self.timeout(deadline))
+            stop, deadline = self.run_batch(batch)
+
+    async def stop(self, timeout: float = 10.0):
+        self.stopped = True
+        if self.thread is not None:
+            self.mailbox.put(_STOP)
+            await asyncio.to_thread(self.thread.join, timeout)
+            self.thread = None
+        elif self.task is not None:
+            self.mailbox.put(_STOP)
+            try:
+                await asyncio.wait_for(self.task, timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.task = None
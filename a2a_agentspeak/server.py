@@ -0,0 +1,61 @@
+import contextlib
+import hashlib
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.utils.constants import PREV_AGENT_CARD_WELL_KNOWN_PATH
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from a2a_agentspeak.bdi import BDIAgentExecutor
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, as for GET)."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class AgentSpeakServer(A2AStarletteApplication):
+    """An A2A server which releases the resources of its agent when the Starlette application shuts down.
+
+    The agent card is serialized once, when the server is built. It is served
+    with a strong ETag and a max-age of card_max_age seconds, and conditional
+    requests with a matching If-None-Match are answered with 304 Not Modified.
+    """
+
+    def __init__(self, executor: BDIAgentExecutor, card_max_age: int = 300, **kwargs):
+        super().__init__(**kwargs)
+        self.executor = executor
+        # the same bytes as the card served by A2AStarletteApplication
+        self.card_body = JSONResponse(
+            self.agent_card.model_dump(exclude_none=True, by_alias=True)
+        ).body
+        self.card_headers = {
+            "ETag": '"' + hashlib.sha256(self.card_body).hexdigest()[:32] + '"',
+            "Cache-Control": "public, max-age=" + str(card_max_age),
+        }
+
+    async def _handle_get_agent_card(self, request: Request) -> Response:
+        if self.card_modifier or request.url.path == PREV_AGENT_CARD_WELL_KNOWN_PATH:
+            return await super()._handle_get_agent_card(request)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and etag_matches(
+            if_none_match, self.card_headers["ETag"]
+        ):
+            return Response(status_code=304, headers=self.card_headers)
+        return Response(
+            self.card_body, media_type="application/json", headers=self.card_headers
+        )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        await self.executor.startup()
+        yield
+        await self.executor.shutdown()
+
+    def build(self, **kwargs):
+        kwargs.setdefault("lifespan", self.lifespan)
+        return super().build(**kwargs)
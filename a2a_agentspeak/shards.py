@@ -0,0 +1,253 @@
+import asyncio
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from a2a_agentspeak.connection_pool import ConnectionPool
+from a2a_agentspeak.host import AgentHost, normalize_prefix
+
+# host of the requests sent to the shards (ignored by the socket transport)
+SHARD_ORIGIN = "http://shard"
+
+# headers which are not forwarded by the router
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+    "content-encoding",
+}
+
+
+@dataclass
+class AgentEntry:
+    """An agent of a manifest: its name (also its path prefix), interface, implementation and tools."""
+
+    name: str
+    interface: str
+    implementation: str
+    tools: str | None = None  # "module:attribute", an iterable of Tool
+
+
+def read_manifest(manifest_file: str) -> list[AgentEntry]:
+    """Read a JSON manifest: {"agents": [{"name", "interface", "implementation", "tools"?}]}.
+    The files are relative to the manifest.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_file))
+    with open(manifest_file) as f:
+        m = json.load(f)
+    entries = []
+    for a in m["agents"]:
+        entries.append(
+            AgentEntry(
+                a["name"],
+                os.path.join(base, a["interface"]),
+                os.path.join(base, a["implementation"]),
+                a.get("tools"),
+            )
+        )
+    return entries
+
+
+def load_tools(spec: str | None):
+    if spec is None:
+        return frozenset()
+    module, attr = spec.split(":")
+    return frozenset(getattr(importlib.import_module(module), attr))
+
+
+def socket_of(sockets_dir: str, shard: int) -> str:
+    return os.path.join(sockets_dir, "shard-" + str(shard) + ".sock")
+
+
+def run_shard(
+    shard: int,
+    entries: list[AgentEntry],
+    placement: dict[str, int],
+    public_url: str,
+    sockets_dir: str,
+    mode: str,
+):
+    """Main function of a shard process: serve its agents on its Unix domain socket."""
+    import uvicorn
+
+    pool = ConnectionPool()
+    agent_host = AgentHost(public_url, pool=pool, mode=mode)
+    for name, s in placement.items():
+        if s != shard:
+            # messages to the agents of the other shards do not go through the router
+            pool.route(agent_host.url_of(name), socket_of(sockets_dir, s))
+    for e in entries:
+        agent_host.add(e.name, e.interface, e.implementation, load_tools(e.tools))
+    uvicorn.run(
+        agent_host.build(), uds=socket_of(sockets_dir, shard), log_level="warning"
+    )
+
+
+class ShardedHost:
+    """The agents of a manifest spread over several processes (shards), behind one router.
+
+    Each shard is an AgentHost (one event loop, one agentspeak Environment) served
+    on a Unix domain socket. The agents are assigned to the shards in turn.
+    The router (built by build) serves the public URL and forwards each request to
+    the shard of the agent named by the first segment of its path.
+    Messages sent between agents of different shards use the sockets of the shards.
+    """
+
+    def __init__(
+        self,
+        manifest_file: str,
+        public_url: str,
+        shards: int | None = None,
+        mode: str = "thread",
+    ):
+        self.entries = read_manifest(manifest_file)
+        self.public_url = public_url.rstrip("/") + "/"
+        n = (os.cpu_count() or 1) if shards is None else shards
+        self.nb_shards = max(1, min(n, len(self.entries)))
+        self.mode = mode
+        self.placement = {
+            e.name.strip("/"): i % self.nb_shards for i, e in enumerate(self.entries)
+        }
+        self.sockets_dir: str | None = None
+        self.processes: list[multiprocessing.Process] = []
+        self.clients: dict[int, httpx.AsyncClient] = {}
+
+    def start(self):
+        """Start the shard processes."""
+        self.sockets_dir = tempfile.mkdtemp(prefix="a2a-shards-")
+        ctx = multiprocessing.get_context("spawn")
+        for shard in range(self.nb_shards):
+            entries = [
+                e for e in self.entries if self.placement[e.name.strip("/")] == shard
+            ]
+            p = ctx.Process(
+                target=run_shard,
+                args=(
+                    shard,
+                    entries,
+                    self.placement,
+                    self.public_url,
+                    self.sockets_dir,
+                    self.mode,
+                ),
+                name="agentspeak-shard-" + str(shard),
+                daemon=True,
+            )
+            p.start()
+            self.processes.append(p)
+
+    def stop(self, timeout: float = 10.0):
+        for p in self.processes:
+            p.terminate()
+        for p in self.processes:
+            p.join(timeout)
+        self.processes = []
+        if self.sockets_dir is not None:
+            shutil.rmtree(self.sockets_dir, ignore_errors=True)
+            self.sockets_dir = None
+
+    def client_of(self, shard: int) -> httpx.AsyncClient:
+        c = self.clients.get(shard)
+        if c is None:
+            c = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    uds=socket_of(self.sockets_dir, shard)
+                ),
+                timeout=httpx.Timeout(30.0),
+            )
+            self.clients[shard] = c
+        return c
+
+    async def forward(self, request: Request) -> Response:
+        agent = request.path_params["agent"]
+        shard = self.placement.get(agent)
+        if shard is None:
+            return PlainTextResponse("Unknown agent: " + agent, status_code=404)
+        headers = {
+            k: v for k, v in request.headers.items() if k not in HOP_BY_HOP_HEADERS
+        }
+        path = request.url.path
+        if path == "/" + agent:
+            path += "/"  # the URL of the agent (the shard would redirect to it)
+        try:
+            r = await self.client_of(shard).request(
+                request.method,
+                SHARD_ORIGIN + path,
+                params=request.query_params,
+                headers=headers,
+                content=await request.body(),
+            )
+        except httpx.ConnectError:
+            return PlainTextResponse("Agent not available: " + agent, status_code=503)
+        except httpx.HTTPError as e:
+            return PlainTextResponse(str(e), status_code=502)
+        headers = {k: v for k, v in r.headers.items() if k not in HOP_BY_HOP_HEADERS}
+        location = headers.get("location")
+        if location is not None and location.startswith(SHARD_ORIGIN + "/"):
+            # redirections of the shards, to the public URL
+            headers["location"] = self.public_url.rstrip("/") + location.removeprefix(
+                SHARD_ORIGIN
+            )
+        return Response(r.content, status_code=r.status_code, headers=headers)
+
+    async def wait_ready(self, timeout: float = 30.0):
+        """Wait until the socket of each shard accepts requests."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        for shard in range(self.nb_shards):
+            while True:
+                try:
+                    await self.client_of(shard).get(SHARD_ORIGIN + "/")
+                    break
+                except httpx.TransportError:
+                    pass
+                if shard < len(self.processes) and not self.processes[shard].is_alive():
+                    raise RuntimeError("The shard " + str(shard) + " stopped.")
+                if loop.time() > deadline:
+                    raise RuntimeError(
+                        "The shard " + str(shard) + " did not start in time."
+                    )
+                await asyncio.sleep(0.05)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        if not self.processes:
+            self.start()
+        try:
+            await self.wait_ready()
+            yield
+        finally:
+            for c in self.clients.values():
+                await c.aclose()
+            self.clients = {}
+            self.stop()
+
+    def url_of(self, name: str) -> str:
+        return self.public_url.rstrip("/") + normalize_prefix(name) + "/"
+
+    def build(self, **kwargs) -> Starlette:
+        """The router. Starting it starts the shards, and waits for them."""
+        methods = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+        routes = [
+            Route("/{agent}/{path:path}", self.forward, methods=methods),
+            Route("/{agent}", self.forward, methods=methods),
+        ]
+        return Starlette(routes=routes, lifespan=self.lifespan, **kwargs)
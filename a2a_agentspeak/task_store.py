@@ -0,0 +1,115 @@
+import collections
+import time
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+
+TERMINAL_STATES = [
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+]
+
+
+class BoundedTaskStore(TaskStore):
+    """In-memory task store which forgets tasks, unlike InMemoryTaskStore.
+
+    A task is evicted when it has not been used for ttl seconds, or when the
+    store holds more than max_tasks tasks or more than max_bytes bytes. Only the
+    tasks which are over (completed, failed...) are evicted for these limits, least
+    recently used first: the tasks in progress only expire (ttl).
+    The size of a task is the size of its JSON form.
+    With keep_terminal=False, tasks which are over (completed, failed...) are not kept at all.
+    """
+
+    def __init__(
+        self,
+        max_tasks: int = 1000,
+        ttl: float | None = 3600.0,
+        max_bytes: int | None = None,
+        keep_terminal: bool = True,
+    ):
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.keep_terminal = keep_terminal
+        # task id -> (task, size, time of last use), least recently used first
+        self.tasks: collections.OrderedDict[str, tuple[Task, int, float]] = (
+            collections.OrderedDict()
+        )
+        self.bytes = 0
+
+        # metrics
+        self.evicted = 0
+        self.expired = 0
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "tasks": len(self.tasks),
+            "bytes": self.bytes,
+            "evicted": self.evicted,
+            "expired": self.expired,
+        }
+
+    def remove(self, task_id: str):
+        _, size, _ = self.tasks.pop(task_id)
+        self.bytes -= size
+
+    def expire(self):
+        if self.ttl is None:
+            return
+        limit = time.monotonic() - self.ttl
+        while self.tasks:
+            task_id, (_, _, saved) = next(iter(self.tasks.items()))
+            if saved > limit:
+                break
+            self.remove(task_id)
+            self.expired += 1
+
+    def over_limits(self) -> bool:
+        return len(self.tasks) > self.max_tasks or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        )
+
+    def evict(self):
+        if not self.over_limits():
+            return
+        for task_id, (task, _, _) in list(self.tasks.items()):
+            if task.status.state in TERMINAL_STATES:
+                self.remove(task_id)
+                self.evicted += 1
+                if not self.over_limits():
+                    break
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        if task.id in self.tasks:
+            self.remove(task.id)
+        if self.keep_terminal or task.status.state not in TERMINAL_STATES:
+            size = len(task.model_dump_json(exclude_none=True))
+            self.tasks[task.id] = (task, size, time.monotonic())
+            self.bytes += size
+        self.expire()
+        self.evict()
+
+    async def get(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> Task | None:
+        self.expire()
+        entry = self.tasks.get(task_id)
+        if entry is None:
+            return None
+        task, size, _ = entry
+        self.tasks[task_id] = (task, size, time.monotonic())
+        self.tasks.move_to_end(task_id)
+        return task
+
+    async def delete(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> None:
+        if task_id in self.tasks:
+            self.remove(task_id)
@@ -0,0 +1,185 @@
+import re
+
+import agentspeak
+
+
+class TermSyntaxError(Exception):
+    def __init__(self, text: str, pos: int, expected: str):
+        super().__init__(
+            "Expected " + expected + " at position " + str(pos) + " in: " + text
+        )
+        self.text = text
+        self.pos = pos
+
+
+_SPACES = " \t\r\n"
+_DIGITS = "0123456789"
+_NAME = re.compile(r"\w*")
+_NUMBER = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+_STRINGS = {
+    '"': re.compile(r'"((?:[^"\\]|\\.)*)"', re.DOTALL),
+    "'": re.compile(r"'((?:[^'\\]|\\.)*)'", re.DOTALL),
+}
+
+
+class TermParser:
+    """Single-pass parser of AgentSpeak terms, as printed by agentspeak (asl_repr).
+
+    Supported: literals with arguments and annotations (foo(1, bar)[source(x)]),
+    numbers, strings (double or single quotes), true/false, lists ([a, b] and [H|T]),
+    and variables (X, _, and the _X_... names printed for unbound variables).
+    The terms are built directly: literals are agentspeak.Literal, lists are tuples
+    (or agentspeak.LinkedList with a variable tail), and a variable name denotes the
+    same agentspeak.Var everywhere in the parsed text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.variables: dict[str, agentspeak.Var] = {}
+
+    def error(self, expected: str) -> TermSyntaxError:
+        return TermSyntaxError(self.text, self.pos, expected)
+
+    def peek(self) -> str:
+        """The next character which is not a space ("" at the end), without consuming it."""
+        t = self.text
+        n = len(t)
+        while self.pos < n:
+            c = t[self.pos]
+            if c not in _SPACES:
+                return c
+            self.pos += 1
+        return ""
+
+    def expect(self, c: str):
+        if self.peek() != c:
+            raise self.error("'" + c + "'")
+        self.pos += 1
+
+    def name(self) -> str:
+        start = self.pos
+        self.pos = _NAME.match(self.text, start).end()
+        return self.text[start : self.pos]
+
+    def variable(self, name: str) -> agentspeak.Var:
+        if name == "_":
+            return agentspeak.Var()
+        v = self.variables.get(name)
+        if v is None:
+            v = agentspeak.Var()
+            self.variables[name] = v
+        return v
+
+    def parse(self) -> agentspeak.Literal:
+        """Parse the whole text as a literal."""
+        c = self.peek()
+        if not c.islower():
+            raise self.error("a literal")
+        lit = self.literal()
+        if self.peek() != "":
+            raise self.error("the end of the term")
+        return lit
+
+    def parse_list(self) -> tuple:
+        """Parse the whole text as a list of terms (no tail)."""
+        l = self.list_term()
+        if not isinstance(l, tuple):
+            raise self.error("a list without tail")
+        if self.peek() != "":
+            raise self.error("the end of the list")
+        return l
+
+    def term(self):
+        c = self.peek()
+        if c == "":
+            raise self.error("a term")
+        elif c == "[":
+            return self.list_term()
+        elif c == '"' or c == "'":
+            return self.string()
+        elif c in _DIGITS or c == "-" or c == "+":
+            return self.number()
+        elif c.isupper() or c == "_":
+            return self.variable(self.name())
+        elif c.isalpha():
+            return self.literal()
+        else:
+            raise self.error("a term")
+
+    def terms(self, close: str) -> list:
+        """Comma separated terms (possibly none) up to the closing character (excluded)."""
+        if self.peek() == close:
+            return []
+        l = [self.term()]
+        while self.peek() == ",":
+            self.pos += 1
+            l.append(self.term())
+        return l
+
+    def literal(self):
+        functor = self.name()
+        if functor == "true" or functor == "false":
+            return functor == "true"
+        args = ()
+        annots = frozenset()
+        if self.pos < len(self.text) and self.text[self.pos] == "(":
+            self.pos += 1
+            args = tuple(self.terms(")"))
+            self.expect(")")
+        if self.pos < len(self.text) and self.text[self.pos] == "[":
+            self.pos += 1
+            annots = frozenset(self.terms("]"))
+            self.expect("]")
+        return agentspeak.Literal(functor, args, annots)
+
+    def list_term(self):
+        self.expect("[")
+        items = self.terms("]")
+        tail = None
+        if items and self.peek() == "|":
+            self.pos += 1
+            tail = self.term()
+        self.expect("]")
+        if tail is None:
+            return tuple(items)
+        for item in reversed(items):
+            tail = agentspeak.LinkedList(item, tail)
+        return tail
+
+    def string(self):
+        m = _STRINGS[self.text[self.pos]].match(self.text, self.pos)
+        if m is None:
+            raise self.error("the end of the string")
+        self.pos = m.end()
+        raw = m.group(1)
+        if "\\" not in raw:
+            return raw
+        # escapes as produced by asl_repr (unicode_escape)
+        try:
+            return raw.encode("latin-1", "backslashreplace").decode("unicode_escape")
+        except UnicodeDecodeError:
+            self.pos = m.start()
+            raise self.error("a string with valid escapes")
+
+    def number(self):
+        m = _NUMBER.match(self.text, self.pos)
+        if m is None:
+            raise self.error("a number")
+        self.pos = m.end()
+        if m.group(1).isdigit() and m.group(2) is None:
+            return int(m.group())
+        else:
+            return float(m.group())
+
+
+def parse_literal(text: str) -> agentspeak.Literal:
+    """Parse an AgentSpeak literal (raise TermSyntaxError if the text is not one)."""
+    if text.isidentifier() and text[0].islower() and text.isascii():
+        return agentspeak.Literal(text)  # atom (the most frequent content)
+    return TermParser(text).parse()
+
+
+def parse_list(text: str) -> tuple:
+    """Parse an AgentSpeak list (raise TermSyntaxError if the text is not one)."""
+    return TermParser(text).parse_list()
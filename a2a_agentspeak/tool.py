@@ -4,7 +4,17 @@ from typing import Callable
 
 @dataclass
 class Tool:
+    """An action given to an agent. kind is one of:
+     * "function": the implementation is called in the reasoning cycle.
+     * "coroutine": the implementation is an async function, the intention is suspended until it returns.
+     * "threaded": the implementation is a blocking function, called in a thread pool
+       (at most max_concurrency calls at the same time), the intention is suspended until it returns.
+    For the suspending kinds, the action fails if it does not return within timeout seconds (if not None).
+    """
+
     kind: str
     action_name: str
     arity: tuple
     implementation: Callable
+    max_concurrency: int = 1
+    timeout: float | None = None
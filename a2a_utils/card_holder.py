@@ -1,55 +1,109 @@
+import asyncio
 import logging
 
 import httpx
-from a2a.client import A2ACardResolver
 from a2a.types import AgentCard
 from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
+from a2a_agentspeak.card_cache import CardCache, default_card_cache
+from a2a_agentspeak.connection_pool import ConnectionPool
+
 
 async def get_card(url: str) -> AgentCard:
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)  # Get a logger instance
 
-    async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=30)) as httpx_client:
-        # Initialize A2ACardResolver
-        resolver = A2ACardResolver(
-            httpx_client=httpx_client,
-            base_url=url,
-        )
+    # cards are shared with the agents of this process (see bdi.do_send)
+    _public_card = default_card_cache.lookup(url)
+    if _public_card is not None:
+        return _public_card
 
+    async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=30)) as httpx_client:
         logger.info(
             f"Attempting to fetch public agent card from: {url}{AGENT_CARD_WELL_KNOWN_PATH}"
         )
-        _public_card: AgentCard = (
-            await resolver.get_agent_card()
-        )  # Fetches from default public path
+        _public_card: AgentCard = await default_card_cache.get(url, httpx_client)
         return _public_card
 
 
 class CardHolder:
+    """Agent cards retrieved from their agents.
+
+    The cards are fetched through a shared connection pool, and kept in a card cache
+    (by default the cache shared with the agents of this process, see bdi.do_send),
+    so that a card fetched less than its TTL ago is not fetched again.
+    """
 
     cards: list[AgentCard]
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool: ConnectionPool | None = None,
+        card_cache: CardCache = default_card_cache,
+        timeout: float = 5.0,
+        max_concurrency: int = 16,
+    ):
+        """timeout is the time given to each URL, max_concurrency the number of cards fetched at the same time."""
         self.cards = []
+        self.owns_pool = pool is None
+        self.pool = ConnectionPool(timeout=timeout) if pool is None else pool
+        self.card_cache = card_cache
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
 
-    async def retrieve_card_from(self, url) -> bool:
+    async def fetch(self, url: str, semaphore: asyncio.Semaphore) -> AgentCard:
+        card = self.card_cache.lookup(url)
+        if card is not None:
+            return card
+        async with semaphore:
+            return await asyncio.wait_for(
+                self.card_cache.get(url, self.pool.client_for(url)), self.timeout
+            )
+
+    async def retrieve_cards_from(self, urls: list[str]) -> dict[str, Exception | None]:
+        """Fetch the cards of these agents concurrently, and add those received to the cards (in the order of urls).
+        Return, for each URL, the error which prevented to get its card (None if the card was received).
+        """
         logging.basicConfig(level=logging.INFO)
         logger = logging.getLogger(__name__)  # Get a logger instance
 
-        try:
-            _public_card: AgentCard = await get_card(url)
-
-            logger.info("Successfully fetched public agent card:")
-            self.cards.append(_public_card)
-            logger.info(
-                "\nUsing PUBLIC agent card for client initialization (default)."
-            )
-            return True
+        urls = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(self.fetch(url, semaphore) for url in urls), return_exceptions=True
+        )
+        report = {}
+        for url, r in zip(urls, results):
+            if isinstance(r, asyncio.TimeoutError):
+                r = TimeoutError(
+                    "No agent card from "
+                    + url
+                    + " after "
+                    + str(self.timeout)
+                    + " seconds"
+                )
+            if isinstance(r, Exception):
+                logger.info(
+                    "Failed to fetch the agent card from " + url + ": " + str(r)
+                )
+                report[url] = r
+            elif isinstance(r, BaseException):
+                raise r
+            else:
+                self.cards.append(r)
+                report[url] = None
+        return report
 
-        except Exception:
-            logger.info("Client failed to fetch the public agent card.")
-            return False
+    async def retrieve_card_from(self, url) -> bool:
+        report = await self.retrieve_cards_from([url])
+        return report[url] is None
 
     def cards_with(self, predicate):
         return [c for c in self.cards if predicate(c)]
+
+    async def aclose(self):
+        """Close the connection pool of the holder (if it owns it), when the discovery is done.
+        The cards retrieved remain available.
+        """
+        if self.owns_pool:
+            await self.pool.aclose()
@@ -0,0 +1,100 @@
+import context
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+from a2a_agentspeak.asl_cache import CACHE_DIR_VARIABLE
+
+# time to first served request of the agents of samples/ping, each in a new process
+
+ping_dir = os.path.join(os.path.dirname(context.__file__), "..", "samples", "ping")
+agents = ["receiver", "sender"]
+port = 9990
+repeat = 5
+# the ASL cache of the agent processes (emptied for the cold starts)
+cache_dir = os.path.join(tempfile.mkdtemp(), "asl")
+
+# what an agent process does (see samples/ping/run_receiver_agent.py)
+agent_process = """
+import sys
+import uvicorn
+sys.path.insert(0, {root!r})
+from a2a_agentspeak.asp_build import from_file
+a = from_file({name!r} + ".asi", {name!r} + ".asl", "http://127.0.0.1:{port}/")
+uvicorn.run(a.build_server().build(), host="127.0.0.1", port={port}, log_level="warning")
+"""
+
+
+def time_to_first_request(name: str) -> float:
+    code = agent_process.format(
+        root=os.path.abspath(os.path.join(ping_dir, "../..")), name=name, port=port
+    )
+    start = time.perf_counter()
+    p = subprocess.Popen(
+        [sys.executable, "-c", code],
+        cwd=ping_dir,
+        env={**os.environ, CACHE_DIR_VARIABLE: cache_dir},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client() as client:
+            while True:
+                try:
+                    r = client.get(
+                        "http://127.0.0.1:" + str(port) + AGENT_CARD_WELL_KNOWN_PATH
+                    )
+                    if r.status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                if p.poll() is not None:
+                    raise Exception("The agent process stopped.")
+                time.sleep(0.005)
+    finally:
+        p.terminate()
+        p.wait()
+
+
+def import_time(module: str) -> float:
+    code = (
+        "import sys, time; sys.path.insert(0, {root!r}); t = time.perf_counter(); "
+        "import {module}; print(time.perf_counter() - t)"
+    ).format(root=os.path.abspath(os.path.join(ping_dir, "../..")), module=module)
+    return float(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def ms(t: float) -> str:
+    return format(t * 1000, ".0f").rjust(5) + " ms"
+
+
+if __name__ == "__main__":
+    for module in [
+        "a2a_agentspeak.message_codec",
+        "a2a_agentspeak.asp_build",
+        "a2a_agentspeak.server",
+    ]:
+        t = statistics.median(import_time(module) for _ in range(repeat))
+        print(("import " + module).ljust(42) + ms(t))
+    for name in agents:
+        cold = []
+        for _ in range(repeat):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(time_to_first_request(name))
+        warm = [time_to_first_request(name) for _ in range(repeat)]
+        print(
+            ("first request to " + name).ljust(42)
+            + "cold"
+            + ms(statistics.median(cold))
+            + "   warm"
+            + ms(statistics.median(warm))
+        )
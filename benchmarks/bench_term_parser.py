@@ -0,0 +1,40 @@
+import context
+
+import timeit
+
+from a2a_agentspeak.asl_message import lit_of_str_eval
+from a2a_agentspeak.term_parser import parse_literal
+
+# typical message contents
+contents = [
+    "pong",
+    "build",
+    "secret(42)",
+    'spec("a function which computes the factorial of its argument")',
+    'reply(["def f(n):", "  return 1"])',
+    "failure(3)",
+    "reply([a, b(1), c([2, 3])])",
+]
+
+number = 20000
+
+if __name__ == "__main__":
+    for c in contents:
+        t_eval = timeit.timeit(lambda: lit_of_str_eval(c), number=number)
+        t_parser = timeit.timeit(lambda: parse_literal(c), number=number)
+        print(
+            c[:40].ljust(42)
+            + "eval: "
+            + format(t_eval / number * 1e6, ".2f")
+            + " us   parser: "
+            + format(t_parser / number * 1e6, ".2f")
+            + " us"
+        )
+        if str(lit_of_str_eval(c)) != str(parse_literal(c)):
+            print(
+                "  (different results: "
+                + str(lit_of_str_eval(c))
+                + " / "
+                + str(parse_literal(c))
+                + ")"
+            )
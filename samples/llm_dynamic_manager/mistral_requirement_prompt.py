@@ -1,12 +1,18 @@
+import functools
 import os
 
 from agentspeak import AslError
-from mistralai import Mistral
 
 llm_api_key = os.environ["MISTRAL_API_KEY"]
 llm_model = "mistral-small-latest"
 
-llm_client = Mistral(api_key=llm_api_key)
+
+@functools.cache
+def llm_client():
+    """The client is created on first use: importing mistralai is slow."""
+    from mistralai import Mistral
+
+    return Mistral(api_key=llm_api_key)
 
 
 def log(m):
@@ -15,7 +21,7 @@ def log(m):
 
 def ask_llm_for_coverage(spec, req_list):
     try:
-        chat_response = llm_client.chat.complete(
+        chat_response = llm_client().chat.complete(
             model=llm_model,
             messages=[
                 {
@@ -60,7 +66,7 @@ def ask_llm_for_coverage(spec, req_list):
 
 def ask_llm_for_completion(spec: str, req_list: str):
     try:
-        chat_response = llm_client.chat.complete(
+        chat_response = llm_client().chat.complete(
             model=llm_model,
             messages=[
                 {
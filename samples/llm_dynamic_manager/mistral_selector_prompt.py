@@ -1,15 +1,21 @@
+import functools
 import os
 
 from a2a.types import AgentCard
 from agentspeak import AslError
-from mistralai import Mistral
 
 from a2a_agentspeak.skill import asl_skill_of_a2a_skill
 
 llm_api_key = os.environ["MISTRAL_API_KEY"]
 llm_model = "mistral-small-latest"
 
-llm_client = Mistral(api_key=llm_api_key)
+
+@functools.cache
+def llm_client():
+    """The client is created on first use: importing mistralai is slow."""
+    from mistralai import Mistral
+
+    return Mistral(api_key=llm_api_key)
 
 
 def log(m):
@@ -31,7 +37,7 @@ def ask_llm_for_agent(query, lst: list[AgentCard]):
         + str_lst
     )
     try:
-        chat_response = llm_client.chat.complete(
+        chat_response = llm_client().chat.complete(
             model=llm_model,
             messages=[
                 {
@@ -1,17 +1,20 @@
+import functools
 import os
 
-import openai
 from agentspeak import AslError
-from openai import OpenAI
-
-openai.log = "debug"
 
 llm_api_key = os.environ["OPENAI_API_KEY"]
 llm_model = "gpt-4o-mini"
+llm_timeout = 60  # seconds
 
-llm_client = OpenAI(api_key=llm_api_key)
 
-llm_timeout = 60  # seconds
+@functools.cache
+def llm_client():
+    """The client is created on first use: importing openai is slow."""
+    import openai
+
+    openai.log = "debug"
+    return openai.OpenAI(api_key=llm_api_key)
 
 
 def log(m):
@@ -21,7 +24,7 @@ def log(m):
 def ask_llm_for_coverage(spec: str, req_list: str):
     log("Asking LLM for coverage (timeout " + str(llm_timeout) + " seconds)")
     try:
-        chat_response = llm_client.responses.create(
+        chat_response = llm_client().responses.create(
             model=llm_model,
             instructions=(
                 "Given a specification of a system, and a list of atomic requirements, tell if that list of atomic requirements covers well that specification."
@@ -66,7 +69,7 @@ def ask_llm_for_coverage(spec: str, req_list: str):
 def ask_llm_for_completion(spec: str, req_list: str):
     log("Asking LLM for completion  (timeout " + str(llm_timeout) + " seconds)")
     try:
-        chat_response = llm_client.responses.create(
+        chat_response = llm_client().responses.create(
             model=llm_model,
             instructions="Given a specification of a system, and a list of atomic requirements, give an atomic requirements that covers the specification and which is not included in the given list of requirements."
             + " Answer with the new requirement, don't explain.",
@@ -100,9 +100,13 @@ async def main() -> None:
     print("-running a2a-server for client agent-")
 
     # 2) query the other a2a agents
+    # (concurrently: an agent which does not answer does not delay the others)
     card_holder = CardHolder()
-    for url in solution_agent_urls:
-        await card_holder.retrieve_card_from(url)
+    report = await card_holder.retrieve_cards_from(solution_agent_urls)
+    for url, error in report.items():
+        if error is not None:
+            print("No agent card from " + url + ": " + str(error))
+    await card_holder.aclose()  # the cards stay available
 
     # 3) select the convenient agent
     if card_holder.cards is []:
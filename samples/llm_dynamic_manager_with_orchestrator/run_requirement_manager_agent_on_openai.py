@@ -50,20 +50,25 @@ if __name__ == "__main__":
     host = "127.0.0.1"
     port = 9992
 
+    # the LLM clients block: they are called out of the reasoning cycle
+    llm_timeout = 60  # seconds
+
     name = "llm_based_requirement_manager"
 
     action1 = a2a_agentspeak.tool.Tool(
-        "function",
+        "threaded",
         ".prompt_completeness",
         (agentspeak.Literal, agentspeak.Literal),
         prompt_completeness,
+        timeout=llm_timeout,
     )
 
     action2 = a2a_agentspeak.tool.Tool(
-        "function",
+        "threaded",
         ".prompt_generate",
         (agentspeak.Literal, agentspeak.Literal),
         prompt_generation,
+        timeout=llm_timeout,
     )
 
     # define agent interface and implementation
@@ -19,6 +19,7 @@ import uvicorn
 
 from a2a_agentspeak.message_codec import (
     build_basic_request,
+    build_multipart_request,
     extract_text,
 )
 from a2a_agentspeak.skill import asl_skill_of_a2a_skill
@@ -82,6 +83,16 @@ async def send_message(dest: AgentCard, illoc: str, content: str, reply_to: str)
         await send_request(client, request)
 
 
+async def send_messages(
+    dest: AgentCard, messages: list[tuple[str, str]], reply_to: str
+):
+    """Send several (illocution, content) in one A2A message (processed all together)."""
+    async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=30)) as httpx_client:
+        client = A2AClient(httpx_client=httpx_client, agent_card=dest)
+        request = build_multipart_request(messages, reply_to)
+        await send_request(client, request)
+
+
 class ClientAgentExecutor(AgentExecutor):
 
     def __init__(self, orchestrator_agent: AgentCard):
@@ -156,9 +167,13 @@ async def main() -> None:
     print("-running a2a-server for client agent-")
 
     # 2) query the other a2a agents
+    # (concurrently: an agent which does not answer does not delay the others)
     card_holder = CardHolder()
-    for url in solution_agent_urls:
-        await card_holder.retrieve_card_from(url)
+    report = await card_holder.retrieve_cards_from(solution_agent_urls)
+    for url, error in report.items():
+        if error is not None:
+            print("No agent card from " + url + ": " + str(error))
+    await card_holder.aclose()  # the cards stay available
 
     # 3) select the convenient agent
     if card_holder.cards is []:
@@ -187,14 +202,14 @@ async def main() -> None:
     print("Selected : " + selected_agent_card.name)
     the_client_agent_executor.current_selected_agent = selected_agent_card
 
-    # inform the orchestrator of the selection
+    # inform the orchestrator of the selection, give the spec and start the job (one message)
     info = "selected(" + neutralize_str(selected_agent_card.url) + ")"
-    await send_message(orchestrator_agent_card, "tell", info, my_url)
-
     info2 = "spec(" + neutralize_str(spec1) + ")"
-    await send_message(orchestrator_agent_card, "tell", info2, my_url)
-
-    await send_message(orchestrator_agent_card, "achieve", "build", my_url)
+    await send_messages(
+        orchestrator_agent_card,
+        [("tell", info), ("tell", info2), ("achieve", "build")],
+        my_url,
+    )
 
 
 if __name__ == "__main__":
@@ -11,3 +11,6 @@ def build_url(host: str, port: int) -> str:
 port_sender = 9999
 port_receiver = 9998
 port_client = 9997
+
+# all the agents in one process (see run_hosted_agents.py)
+port_host = 9996
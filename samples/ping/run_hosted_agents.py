@@ -0,0 +1,26 @@
+import context
+
+import threading
+import uvicorn
+
+from a2a_agentspeak.host import AgentHost
+
+host = "0.0.0.0"
+port = context.port_host
+
+
+from context import build_url
+
+if __name__ == "__main__":
+
+    # the sender and the receiver share one process, one port, and one agentspeak environment
+    agent_host = AgentHost(build_url(host, port), mode="thread")
+
+    for name in ["sender", "receiver"]:
+        agent_host.add(name, name + ".asi", name + ".asl")
+
+    def start():
+        uvicorn.run(agent_host.build(), host=host, port=port)
+
+    threading.Thread(target=start).start()
+    print("-running a2a-server for sender and receiver agents-")
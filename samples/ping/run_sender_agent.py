@@ -19,7 +19,8 @@ if __name__ == "__main__":
     a = from_file(name + ".asi", name + ".asl", build_url(host, port))
 
     # build and run the a2a server
-    server = a.build_server()
+    # the plans of this agent wait (.wait), they run out of the event loop of the server
+    server = a.build_server(mode="thread")
 
     def start():
         uvicorn.run(server.build(), host=host, port=port)
@@ -0,0 +1,23 @@
+import context
+
+import threading
+import uvicorn
+
+from a2a_agentspeak.shards import ShardedHost
+
+host = "0.0.0.0"
+port = context.port_host
+
+
+from context import build_url
+
+if __name__ == "__main__":
+
+    # the sender and the receiver run in two processes, behind one router on one port
+    sharded_host = ShardedHost("manifest.json", build_url(host, port), shards=2)
+
+    def start():
+        uvicorn.run(sharded_host.build(), host=host, port=port)
+
+    threading.Thread(target=start).start()
+    print("-running a2a-server for sender and receiver agents (2 shards)-")
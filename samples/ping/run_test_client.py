@@ -1,6 +1,7 @@
 import context
 
 import logging
+import sys
 import threading
 
 import httpx
@@ -52,8 +53,14 @@ async def main() -> None:
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)  # Get a logger instance
 
-    sender_agent_url = "http://127.0.0.1:" + str(context.port_sender)
-    receiver_agent_url = "http://127.0.0.1:" + str(context.port_receiver)
+    if "hosted" in sys.argv:
+        # agents started by run_hosted_agents.py
+        host_url = "http://127.0.0.1:" + str(context.port_host)
+        sender_agent_url = host_url + "/sender/"
+        receiver_agent_url = host_url + "/receiver/"
+    else:
+        sender_agent_url = "http://127.0.0.1:" + str(context.port_sender)
+        receiver_agent_url = "http://127.0.0.1:" + str(context.port_receiver)
     my_url = "http://127.0.0.1:" + str(context.port_client)
 
     # 1) start an a2a server
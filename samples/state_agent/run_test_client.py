@@ -23,6 +23,7 @@ import uvicorn
 from a2a_agentspeak.message_codec import (
     build_basic_request,
     extract_text,
+    extract_texts,
 )
 
 
@@ -140,6 +141,11 @@ async def main() -> None:
         response = await client.send_message(request)
         print("Synchronous reply received: " + extract_text(response))
 
+        # Several literals in one ask (one answer per literal)
+        request = build_basic_request("ask", "[secret, secret(0)]", my_url)
+        response = await client.send_message(request)
+        print("Synchronous reply received: " + str(extract_texts(response)))
+
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,38 @@
+import os
+
+from a2a_agentspeak.asp_build import from_file
+from a2a_agentspeak.bdi import BDIAgent
+
+STATE_AGENT = os.path.join(os.path.dirname(__file__), "..", "samples", "state_agent")
+URL = "http://127.0.0.1:9990/"
+
+ASL = """item(a, 1).
+item(b, 2).
+flag.
+"""
+
+
+def state_agent() -> BDIAgent:
+    a = from_file(
+        os.path.join(STATE_AGENT, "state.asi"),
+        os.path.join(STATE_AGENT, "state.asl"),
+        URL,
+    )
+    return BDIAgent(a.implementation_file, URL, set(), ask_arities=a.ask_arities())
+
+
+def test_functor_only_ask_of_an_arity_0_skill():
+    # the interface declares secret : 0, the belief is secret(X): the value is answered, as before
+    agent = state_agent()
+    assert agent.get_belief("secret") == "-1.0"
+    assert agent.get_belief("secret(X)") == "secret(-1)"
+
+
+def test_ask_patterns(tmp_path):
+    asl = tmp_path / "items.asl"
+    asl.write_text(ASL)
+    agent = BDIAgent(str(asl), URL, set(), ask_arities={"item": 2, "flag": 0})
+    assert agent.get_belief("item") == "item(a, 1)\nitem(b, 2)"
+    assert agent.get_belief("item(b, X)") == "item(b, 2)"
+    assert agent.get_belief("item(c, X)") is None
+    assert agent.get_belief("flag") == "flag"
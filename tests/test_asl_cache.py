@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+from a2a_agentspeak import asl_cache
+
+ASL = """count(0).
+
++!incr : count(N) <- -count(N); +count(N + 1).
+"""
+
+
+@pytest.fixture
+def asl_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(asl_cache, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(asl_cache, "_loaded", {})
+    monkeypatch.setattr(asl_cache, "_keys", {})
+    f = tmp_path / "counter.asl"
+    f.write_text(ASL)
+    return str(f)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """The files parsed (instead of being found in the cache)."""
+    parsed = []
+    parse = asl_cache.parse
+
+    def counting_parse(asl_file, content):
+        parsed.append(asl_file)
+        return parse(asl_file, content)
+
+    monkeypatch.setattr(asl_cache, "parse", counting_parse)
+    return parsed
+
+
+def cache_files() -> list[str]:
+    return [f for f in os.listdir(asl_cache.cache_dir) if f.endswith(".pickle")]
+
+
+def new_process(monkeypatch):
+    """Forget the ASTs loaded in memory, as a new process would."""
+    monkeypatch.setattr(asl_cache, "_loaded", {})
+
+
+def test_warm_hit(asl_file, parses, monkeypatch):
+    cold = asl_cache.load_ast(asl_file)
+    assert asl_cache.load_ast(asl_file) is cold  # in memory
+    new_process(monkeypatch)
+    warm = asl_cache.load_ast(asl_file)
+    assert str(warm) == str(cold)
+    assert parses == [asl_file]
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda data: b"garbage",
+        lambda data: data[:-10],  # truncated payload
+        lambda data: data.replace(b"count", b"cnt"),  # payload altered, same HMAC
+    ],
+)
+def test_corrupt_cache_file(asl_file, parses, monkeypatch, corrupt):
+    asl_cache.load_ast(asl_file)
+    [name] = cache_files()
+    path = os.path.join(asl_cache.cache_dir, name)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(corrupt(data))
+    new_process(monkeypatch)
+    monkeypatch.setattr(
+        asl_cache.pickle, "loads", lambda data: pytest.fail("unpickled")
+    )
+    asl_cache.load_ast(asl_file)
+    assert parses == [asl_file, asl_file]
+
+
+def test_file_of_another_key_is_not_trusted(asl_file, parses, monkeypatch):
+    asl_cache.load_ast(asl_file)
+    new_process(monkeypatch)
+    monkeypatch.setattr(asl_cache, "_keys", {asl_cache.cache_dir: os.urandom(32)})
+    asl_cache.load_ast(asl_file)
+    assert parses == [asl_file, asl_file]
+
+
+def test_version_bump(asl_file, parses, monkeypatch):
+    asl_cache.load_ast(asl_file)
+    new_process(monkeypatch)
+    monkeypatch.setattr(asl_cache, "_version", lambda: "99.0")
+    asl_cache.load_ast(asl_file)
+    assert parses == [asl_file, asl_file]
+    assert len(cache_files()) == 2
+
+
+def test_no_cache_dir(asl_file, parses, monkeypatch):
+    monkeypatch.setattr(asl_cache, "cache_dir", None)
+    asl_cache.load_ast(asl_file)
+    new_process(monkeypatch)
+    asl_cache.load_ast(asl_file)
+    assert parses == [asl_file, asl_file]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_shared_cache_dir_is_not_used(asl_file, parses, monkeypatch):
+    os.makedirs(asl_cache.cache_dir)
+    os.chmod(asl_cache.cache_dir, 0o777)
+    asl_cache.load_ast(asl_file)
+    assert os.listdir(asl_cache.cache_dir) == []
+
+
+def test_cache_dir_variable(monkeypatch):
+    monkeypatch.setenv(asl_cache.CACHE_DIR_VARIABLE, "/some/dir")
+    assert asl_cache.default_cache_dir() == "/some/dir"
+    monkeypatch.setenv(asl_cache.CACHE_DIR_VARIABLE, "")
+    assert asl_cache.default_cache_dir() is None
@@ -0,0 +1,45 @@
+import io
+
+import agentspeak
+import agentspeak.runtime
+import agentspeak.stdlib
+
+from a2a_agentspeak.belief_index import BeliefSnapshot, IndexedAgent, add_index_actions
+
+
+def run_agent(source: str) -> IndexedAgent:
+    actions = agentspeak.Actions(agentspeak.stdlib.actions)
+    add_index_actions(actions)
+    env = agentspeak.runtime.Environment()
+    f = io.StringIO(source)
+    f.name = "test.asl"
+    agent = env.build_agent(f, actions, agent_cls=IndexedAgent)
+    env.run()
+    return agent
+
+
+def indexed(agent: IndexedAgent) -> set:
+    return {
+        b for group in agent.index.values() for bucket in group.values() for b in bucket
+    }
+
+
+def live(agent: IndexedAgent) -> set:
+    return {b for group in agent.beliefs.values() for b in group}
+
+
+def test_abolish_updates_the_index():
+    agent = run_agent(
+        "!go.\n+!go <- +item(a); +item(b); +other(1); .abolish(item(_)); +item(c).\n"
+    )
+    assert indexed(agent) == live(agent)
+    snapshot = agent.snapshot(BeliefSnapshot())
+    assert {
+        str(b) for b in snapshot.query(agentspeak.Literal("item", (agentspeak.Var(),)))
+    } == {"item(c)"}
+
+
+def test_abolish_with_ground_first_argument():
+    agent = run_agent("!go.\n+!go <- +item(a, 1); +item(b, 2); .abolish(item(a, _)).\n")
+    assert indexed(agent) == live(agent)
+    assert {str(b) for b in live(agent)} == {"item(b, 2)"}
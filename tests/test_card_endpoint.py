@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+from a2a_agentspeak.asp_build import from_file
+from a2a_agentspeak.card_cache import CardCache
+from a2a_agentspeak.server import etag_matches
+
+STATE_AGENT = os.path.join(os.path.dirname(__file__), "..", "samples", "state_agent")
+URL = "http://127.0.0.1:9991/"
+
+
+@pytest.fixture(scope="module")
+def agent():
+    return from_file(
+        os.path.join(STATE_AGENT, "state.asi"),
+        os.path.join(STATE_AGENT, "state.asl"),
+        URL,
+    )
+
+
+def get_card(agent, *headers: dict) -> list[httpx.Response]:
+    """GET the card once per headers, from a server (its lifespan is not run)."""
+    app = agent.build_server(card_max_age=60).build()
+
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=URL
+        ) as client:
+            return [
+                await client.get(AGENT_CARD_WELL_KNOWN_PATH, headers=h) for h in headers
+            ]
+
+    return asyncio.run(main())
+
+
+def test_card_is_served_with_etag_and_max_age(agent):
+    [r] = get_card(agent, {})
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "public, max-age=60"
+    assert r.headers["etag"].startswith('"')
+    assert json.loads(r.content) == agent.build_card().model_dump(
+        exclude_none=True, by_alias=True, mode="json"
+    )
+
+
+def test_conditional_requests(agent):
+    [r] = get_card(agent, {})
+    etag = r.headers["etag"]
+    not_modified, weak, star, other = get_card(
+        agent,
+        {"If-None-Match": etag},
+        {"If-None-Match": '"x", W/' + etag},
+        {"If-None-Match": "*"},
+        {"If-None-Match": '"x"'},
+    )
+    for r in [not_modified, weak, star]:
+        assert r.status_code == 304
+        assert r.content == b""
+        assert r.headers["etag"] == etag
+    assert other.status_code == 200
+
+
+def test_card_cache_revalidates_with_304(agent):
+    app = agent.build_server(card_max_age=0).build()
+    cache = CardCache()
+
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=URL
+        ) as client:
+            first = await cache.get(URL, client)
+            second = await cache.get(URL, client)  # stale (max-age=0): revalidated
+            return first, second
+
+    first, second = asyncio.run(main())
+    assert second is first
+    assert (cache.misses, cache.revalidations) == (2, 1)
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"b", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
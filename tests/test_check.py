@@ -0,0 +1,105 @@
+import io
+
+import agentspeak
+import agentspeak.lexer
+import agentspeak.parser
+import pytest
+
+from a2a_agentspeak.asp_build import InterfaceError, from_file
+from a2a_agentspeak.check import (
+    TriggerIndex,
+    check_achievement,
+    check_ask_belief,
+    check_input_belief,
+)
+
+ASL = """secret(1).
+
++!ping <- .print(ping).
++!move(X, Y) <- .print(X, Y).
+-!stop <- .print(stop).
++ready <- .print(ready).
+-gone <- .print(gone).
+"""
+
+
+def write_agent(tmp_path, interface_lines: list[str]) -> tuple[str, str]:
+    asi = tmp_path / "agent.asi"
+    asi.write_text("name = A\ndoc = An agent.\n\n" + "\n".join(interface_lines))
+    asl = tmp_path / "agent.asl"
+    asl.write_text(ASL)
+    return str(asi), str(asl)
+
+
+def parse(source: str) -> agentspeak.parser.AstAgent:
+    log = agentspeak.Log(agentspeak.get_logger(__name__), 3)
+    f = io.StringIO(source)
+    f.name = "agent.asl"
+    ast = agentspeak.parser.parse(f.name, agentspeak.lexer.TokenStream(f, log), log)
+    log.throw()
+    return ast
+
+
+def test_interface_matches(tmp_path):
+    asi, asl = write_agent(
+        tmp_path,
+        [
+            "belief : secret : 1 : a number",
+            "input : ready : 0 : ready",
+            "action : ping : 0 : ping",
+            "action : move : 2 : move",
+        ],
+    )
+    assert from_file(asi, asl, "http://127.0.0.1:9994/").check().success
+
+
+def test_ask_skill_of_arity_0(tmp_path):
+    # secret : 0 reads the values of secret(X), as before the arities were used
+    asi, asl = write_agent(tmp_path, ["belief : secret : 0 : a number"])
+    a = from_file(asi, asl, "http://127.0.0.1:9994/")
+    assert a.ask_arities() == {"secret": 1}
+
+
+def test_arity_mismatch(tmp_path):
+    asi, asl = write_agent(tmp_path, ["action : move : 1 : move"])
+    with pytest.raises(InterfaceError) as e:
+        from_file(asi, asl, "http://127.0.0.1:9994/")
+    assert e.value.token == "move"
+    assert e.value.mismatches == [
+        "action move/1: arity mismatch with plan +!move (arity 2)"
+    ]
+
+
+def test_all_mismatches_are_reported(tmp_path):
+    asi, asl = write_agent(
+        tmp_path,
+        [
+            "belief : secret : 2 : a pair",
+            "input : ready : 0 : ready",
+            "input : gone : 0 : only a removal plan",
+            "action : stop : 0 : only a removal plan",
+            "action : jump : 0 : no plan",
+        ],
+    )
+    with pytest.raises(InterfaceError) as e:
+        from_file(asi, asl, "http://127.0.0.1:9994/")
+    assert e.value.token == "secret"
+    assert e.value.mismatches == [
+        "belief secret/2: arity mismatch with initial belief secret (arity 1)",
+        "input gone/0: no plan +gone",
+        "action stop/0: no plan +!stop",
+        "action jump/0: no plan +!jump",
+    ]
+    assert str(e.value) == "; ".join(e.value.mismatches)
+
+
+def test_helpers_accept_any_trigger():
+    ast = parse(ASL)
+    index = TriggerIndex(ast)
+    assert check_achievement("ping", ast)
+    assert check_achievement("stop", ast, index)
+    assert not check_achievement("jump", ast, index)
+    assert check_input_belief("gone", ast, index)
+    assert not check_input_belief("ping", ast, index)
+    assert check_ask_belief("secret", ast, index)
+    assert not check_ask_belief("ready", ast, index)
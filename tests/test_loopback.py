@@ -0,0 +1,74 @@
+import asyncio
+
+import agentspeak
+
+from a2a_agentspeak.asl_message import AgentSpeakMessage
+from a2a_agentspeak.bdi import BDIAgentExecutor
+from a2a_agentspeak.outbox import OutgoingMessage
+
+A_URL = "http://127.0.0.1:9997/a/"
+B_URL = "http://127.0.0.1:9997/b/"
+
+# a sends n(N)...n(1) to the given peer, which answers m(X) to each n(X)
+PEER_ASL = """+!go(N, P) : N > 0 <- .send(P, tell, n(N)); !go(N - 1, P).
++!go(0, P).
++n(X) <- .send("A_URL", tell, m(X)).
++m(X) <- +got(X).
+""".replace("A_URL", A_URL)
+
+
+def received(executor: BDIAgentExecutor) -> int:
+    pattern = agentspeak.Literal("got", (agentspeak.Var(),))
+    return len(executor.bdi_agent.snapshot.query(pattern))
+
+
+async def ping(tmp_path, peer_url: str, n: int) -> int:
+    """Start a (whose peer is at peer_url) and b, with outboxes of one message, return the answers received by a."""
+    (tmp_path / "peer.asl").write_text(PEER_ASL)
+    agents = [
+        BDIAgentExecutor(
+            str(tmp_path / "peer.asl"),
+            ["go", "n", "m"],
+            url,
+            set(),
+            mode="thread",
+            outbox_size=1,
+            outbox_workers=1,
+        )
+        for url in [A_URL, B_URL]
+    ]
+    for e in agents:
+        await e.startup()
+    a = agents[0]
+    try:
+        a.bdi_agent.process_message(
+            AgentSpeakMessage("achieve", "go(" + str(n) + ', "' + peer_url + '")', "")
+        )
+        for _ in range(200):
+            if received(a) == n:
+                break
+            await asyncio.sleep(0.05)
+        return received(a)
+    finally:
+        for e in agents:
+            await e.shutdown()
+
+
+def test_agents_pinging_each_other(tmp_path):
+    assert asyncio.run(ping(tmp_path, B_URL, 200)) == 200
+
+
+def test_agent_pinging_itself(tmp_path):
+    assert asyncio.run(ping(tmp_path, A_URL, 200)) == 200
+
+
+def test_delivery_to_a_full_outbox(tmp_path):
+    """The worker which delivers a message may be the only one able to make room in the outbox of the target."""
+    (tmp_path / "peer.asl").write_text(PEER_ASL)
+    b = BDIAgentExecutor(str(tmp_path / "peer.asl"), ["m"], B_URL, set(), outbox_size=1)
+    assert b.bdi_agent.outbox.offer(OutgoingMessage(A_URL, "tell", "m(0)"))
+    reply = asyncio.run(
+        asyncio.wait_for(b.receive_local([AgentSpeakMessage("tell", "m(1)", A_URL)]), 5)
+    )
+    assert reply == "Tell received."
+    assert received(b) == 1
@@ -0,0 +1,34 @@
+import json
+
+from a2a.types import SendMessageRequest
+
+from a2a_agentspeak.message_codec import (
+    build_basic_request,
+    configuration_of,
+    encode_multipart_request,
+)
+
+SENDER = "http://127.0.0.1:9993/"
+
+
+def test_configurations_are_not_shared():
+    c = configuration_of(SENDER)
+    c.push_notification_config.url = "http://elsewhere/"
+    request = build_basic_request("tell", "ready", SENDER)
+    assert request.params.configuration.push_notification_config.url == SENDER
+
+
+def test_encoded_request_is_a_valid_request():
+    body = encode_multipart_request(
+        [("tell", "ready"), ("achieve", 'say("hi")')], SENDER
+    )
+    request = SendMessageRequest.model_validate(json.loads(body))
+    assert [p.root.text for p in request.params.message.parts] == [
+        "ready",
+        'say("hi")',
+    ]
+    assert [p.root.metadata for p in request.params.message.parts] == [
+        {"illocution": "tell"},
+        {"illocution": "achieve"},
+    ]
+    assert request.params.configuration.push_notification_config.url == SENDER
@@ -0,0 +1,69 @@
+import asyncio
+
+import agentspeak
+
+from a2a_agentspeak.asl_message import AgentSpeakMessage
+from a2a_agentspeak.bdi import BDIAgent, LocalReply
+
+SENDER = "http://127.0.0.1:9999/"
+
+ASL = """+!start <- +started.
++!go(X) : X > 1 <- +went(X).
+"""
+
+
+def make_agent(tmp_path) -> BDIAgent:
+    asl = tmp_path / "batch.asl"
+    asl.write_text(ASL)
+    return BDIAgent(str(asl), "http://127.0.0.1:9998/", additional_tools=set())
+
+
+def beliefs(agent: BDIAgent) -> set[str]:
+    return {
+        str(agentspeak.Literal(b.functor, b.args))
+        for group in agent.asp_agent.beliefs.values()
+        for b in group
+    }
+
+
+def batch(*parts: tuple[str, str]) -> list[AgentSpeakMessage]:
+    return [AgentSpeakMessage(i, c, SENDER) for i, c in parts]
+
+
+def test_failing_last_part_undoes_the_batch(tmp_path):
+    agent = make_agent(tmp_path)
+    agent.process_messages(batch(("tell", "kept(1)")))
+    before = beliefs(agent)
+    assert before == {"kept(1)"}
+    agent.process_messages(
+        batch(
+            ("tell", "item(a)"),
+            ("untell", "kept(1)"),
+            ("achieve", "start"),
+            ("achieve", "go(0)"),  # a plan, but not applicable
+        )
+    )
+    assert beliefs(agent) == before
+    assert not agent.asp_agent.intentions
+
+
+def test_batch_applied(tmp_path):
+    agent = make_agent(tmp_path)
+    agent.process_messages(batch(("tell", "kept(1)")))
+    agent.process_messages(
+        batch(("tell", "item(a)"), ("untell", "kept(1)"), ("achieve", "go(2)"))
+    )
+    assert beliefs(agent) == {"item(a)", "went(2)"}
+
+
+def test_batch_without_plan_is_refused_before_ack(tmp_path):
+    agent = make_agent(tmp_path)
+    before = beliefs(agent)
+    r = LocalReply()
+    asyncio.run(
+        agent.preprocess_messages(
+            batch(("tell", "item(a)"), ("achieve", "unknown(1)")), r
+        )
+    )
+    assert r.text() == "No plan to achieve unknown(1) in this agent."
+    assert beliefs(agent) == before
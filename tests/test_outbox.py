@@ -0,0 +1,80 @@
+import asyncio
+
+from a2a_agentspeak.outbox import Outbox, OutgoingMessage
+
+
+def message(i: int) -> OutgoingMessage:
+    return OutgoingMessage("http://127.0.0.1:9992/", "tell", "n(" + str(i) + ")")
+
+
+class Sink:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, m: OutgoingMessage) -> bool:
+        await asyncio.sleep(self.delay)
+        self.sent.append(m)
+        return True
+
+
+def test_offer_rejects_when_full():
+    sink = Sink()
+    # no event loop: the workers are not started, nothing is sent
+    outbox = Outbox(sink.send, max_size=2)
+    assert outbox.offer(message(1))
+    assert outbox.offer(message(2))
+    assert not outbox.offer(message(3))
+    assert outbox.stats() == {
+        "depth": 2,
+        "max_depth": 2,
+        "capacity": 2,
+        "sent": 0,
+        "failed": 0,
+        "rejected": 1,
+    }
+
+
+def test_close_drains():
+    async def main():
+        sink = Sink(delay=0.01)
+        outbox = Outbox(sink.send, max_size=10, workers=2)
+        for i in range(10):
+            assert outbox.offer(message(i))
+        await outbox.close()
+        assert not outbox.offer(message(10))
+        return sink, outbox
+
+    sink, outbox = asyncio.run(main())
+    assert sorted(m.content for m in sink.sent) == sorted(
+        "n(" + str(i) + ")" for i in range(10)
+    )
+    assert outbox.sent == 10 and outbox.rejected == 1
+    assert outbox.workers == []
+
+
+def test_close_gives_up_after_timeout():
+    async def main():
+        sink = Sink(delay=10)
+        outbox = Outbox(sink.send, max_size=10, workers=1)
+        outbox.offer(message(1))
+        outbox.offer(message(2))
+        await outbox.close(timeout=0.1)
+        return sink, outbox
+
+    sink, outbox = asyncio.run(main())
+    assert sink.sent == []
+    assert outbox.workers == []
+
+
+def test_failures_are_counted():
+    async def fail(m):
+        raise RuntimeError("unreachable")
+
+    async def main():
+        outbox = Outbox(fail, max_size=10)
+        outbox.offer(message(1))
+        await outbox.close()
+        return outbox
+
+    assert asyncio.run(main()).failed == 1
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from a2a_agentspeak.scheduler import Mailbox, Scheduler
+
+
+def test_thread_mode_runs_jobs_in_the_reasoning_thread():
+    async def main():
+        scheduler = Scheduler(mode="thread")
+        scheduler.bind_loop(asyncio.get_running_loop())
+        scheduler.start()
+        done = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        threads = []
+
+        def job():
+            threads.append(threading.current_thread())
+            loop.call_soon_threadsafe(done.set)
+
+        scheduler.submit(job)
+        await asyncio.wait_for(done.wait(), 5)
+        reasoning_thread = scheduler.thread
+        await scheduler.stop()
+        return threads, reasoning_thread, scheduler
+
+    threads, reasoning_thread, scheduler = asyncio.run(main())
+    assert threads == [reasoning_thread]
+    assert reasoning_thread is not threading.current_thread()
+    assert not reasoning_thread.is_alive()
+    assert scheduler.jobs == 1
+
+
+def test_stopped_scheduler_refuses_jobs():
+    async def main():
+        scheduler = Scheduler(mode="thread")
+        scheduler.start()
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    with pytest.raises(RuntimeError):
+        scheduler.submit(lambda: None)
+    scheduler.start()
+    assert scheduler.thread is None
+
+
+def test_mailbox_batch_size():
+    mailbox = Mailbox(batch_size=2)
+    for i in range(5):
+        mailbox.put(i)
+    assert [mailbox.get_batch(0), mailbox.get_batch(0), mailbox.get_batch(0)] == [
+        [0, 1],
+        [2, 3],
+        [4],
+    ]
+    assert mailbox.get_batch(0) == []
+
+
+@pytest.mark.parametrize("max_linger, expected", [(0.0, [[1], [2]]), (2.0, [[1, 2]])])
+def test_mailbox_max_linger(max_linger, expected):
+    mailbox = Mailbox(batch_size=2, max_linger=max_linger)
+    batches = []
+
+    def consume():
+        while sum(len(b) for b in batches) < 2:
+            batches.append(mailbox.get_batch(5))
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    mailbox.put(1)
+    time.sleep(0.1)
+    mailbox.put(2)  # the batch is full: no more lingering
+    consumer.join(5)
+    assert batches == expected
+
+
+@pytest.mark.parametrize("max_linger, expected", [(0.0, [1]), (2.0, [1, 2])])
+def test_mailbox_max_linger_async(max_linger, expected):
+    async def main():
+        mailbox = Mailbox(batch_size=2, max_linger=max_linger)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, mailbox.put, 1)
+        loop.call_later(0.1, mailbox.put, 2)
+        return await mailbox.get_batch_async(5)
+
+    assert asyncio.run(main()) == expected
+
+
+def test_mailbox_mode_runs_one_cycle_per_batch():
+    async def main():
+        scheduler = Scheduler(mode="mailbox", batch_size=4)
+        ran = []
+        for i in range(10):
+            scheduler.submit(lambda i=i: ran.append(i))
+        scheduler.start()
+        while len(ran) < 10:
+            await asyncio.sleep(0.01)
+        cycles = scheduler.cycles
+        await scheduler.stop()
+        return ran, cycles
+
+    ran, cycles = asyncio.run(main())
+    assert ran == list(range(10))
+    assert cycles == 3
+
+
+async def twice(x: int) -> int:
+    await asyncio.sleep(0)
+    return 2 * x
+
+
+def test_run_coroutine_before_bind_loop():
+    scheduler = Scheduler(mode="thread")
+    futures = [scheduler.run_coroutine(twice(i)) for i in range(3)]
+    assert not any(f.done() for f in futures)
+
+    async def main():
+        scheduler.bind_loop(asyncio.get_running_loop())
+        return await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+
+    assert asyncio.run(main()) == [0, 2, 4]
+    assert scheduler.pending_coroutines == []
+
+
+def test_run_coroutine_from_the_reasoning_thread():
+    """A coroutine tool started by a plan, before the first request binds the event loop."""
+    scheduler = Scheduler(mode="thread")
+    started = threading.Event()
+    futures = []
+
+    def job():
+        futures.append(scheduler.run_coroutine(twice(21)))
+        started.set()
+
+    scheduler.submit(job)
+    assert started.wait(5)
+
+    async def main():
+        scheduler.bind_loop(asyncio.get_running_loop())
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(futures[0]), 5)
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(main()) == 42
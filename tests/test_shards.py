@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, RedirectResponse
+from starlette.routing import Route
+
+from a2a_agentspeak.shards import ShardedHost
+
+PUBLIC_URL = "http://agents.example:8000/"
+
+
+def make_host(tmp_path, names: list[str], shards: int) -> ShardedHost:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "agents": [
+                    {"name": n, "interface": n + ".asi", "implementation": n + ".asl"}
+                    for n in names
+                ]
+            }
+        )
+    )
+    return ShardedHost(str(manifest), PUBLIC_URL, shards=shards)
+
+
+def test_placement(tmp_path):
+    host = make_host(tmp_path, ["a", "b", "c", "d", "e"], shards=2)
+    assert host.placement == {"a": 0, "b": 1, "c": 0, "d": 1, "e": 0}
+    assert host.url_of("c") == PUBLIC_URL + "c/"
+
+
+def test_no_more_shards_than_agents(tmp_path):
+    host = make_host(tmp_path, ["a", "b"], shards=8)
+    assert host.nb_shards == 2
+    assert sorted(host.placement.values()) == [0, 1]
+
+
+def fake_shard(shard: int) -> Starlette:
+    """Answers with the path it receives, or redirects (like a mounted application would)."""
+
+    async def echo(request: Request):
+        if request.url.path.endswith("/moved"):
+            return RedirectResponse("http://shard/" + request.url.path[1:-6] + "/")
+        return PlainTextResponse(str(shard) + " " + request.url.path)
+
+    return Starlette(routes=[Route("/{path:path}", echo)])
+
+
+async def route(host: ShardedHost, path: str) -> httpx.Response:
+    for shard in range(host.nb_shards):
+        host.clients[shard] = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fake_shard(shard))
+        )
+    # the lifespan (which starts the shard processes) is not run by ASGITransport
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=host.build()), base_url="http://router"
+    ) as client:
+        return await client.get(path)
+
+
+def test_router_forwards_to_the_shard_of_the_agent(tmp_path):
+    host = make_host(tmp_path, ["a", "b"], shards=2)
+    r = asyncio.run(route(host, "/b/.well-known/agent-card.json"))
+    assert r.text == "1 /b/.well-known/agent-card.json"
+
+
+def test_router_adds_the_trailing_slash(tmp_path):
+    host = make_host(tmp_path, ["a", "b"], shards=2)
+    r = asyncio.run(route(host, "/a"))
+    assert r.status_code == 200
+    assert r.text == "0 /a/"
+
+
+def test_router_rewrites_redirections(tmp_path):
+    host = make_host(tmp_path, ["a", "b"], shards=2)
+    r = asyncio.run(route(host, "/a/moved"))
+    assert r.status_code == 307
+    assert r.headers["location"] == PUBLIC_URL + "a/"
+
+
+def test_router_unknown_agent(tmp_path):
+    host = make_host(tmp_path, ["a"], shards=1)
+    assert asyncio.run(route(host, "/z/")).status_code == 404
+
+
+def test_wait_ready(tmp_path):
+    host = make_host(tmp_path, ["a"], shards=1)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("no socket yet")
+        return httpx.Response(404)
+
+    async def main():
+        host.clients[0] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await host.wait_ready(timeout=5)
+
+    asyncio.run(main())
+    assert len(attempts) == 3
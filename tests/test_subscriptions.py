@@ -0,0 +1,133 @@
+import asyncio
+
+from a2a_agentspeak.asl_message import AgentSpeakMessage
+from a2a_agentspeak.bdi import BDIAgent
+
+PEER = "http://127.0.0.1:9996/"
+
+ASL = """secret(1).
+
++!set(X) <- +secret(X).
++!unset(X) <- -secret(X).
+"""
+
+
+class Recorder:
+    """Stands for the subscriber: records the messages sent to it, optionally holding them."""
+
+    def __init__(self):
+        self.sent: list[list[tuple[str, str]]] = []
+        self.release: asyncio.Event | None = None
+
+    async def deliver(self, m) -> bool:
+        if self.release is not None:
+            await self.release.wait()
+        self.sent.append(m.parts())
+        return True
+
+
+def make_agent(tmp_path) -> tuple[BDIAgent, Recorder]:
+    asl = tmp_path / "secret.asl"
+    asl.write_text(ASL)
+    agent = BDIAgent(
+        str(asl),
+        "http://127.0.0.1:9995/",
+        additional_tools=set(),
+        ask_arities={"secret": 1},
+        subscription_window=0.01,
+    )
+    recorder = Recorder()
+    agent.deliver = recorder.deliver
+    return agent, recorder
+
+
+def achieve(agent: BDIAgent, goal: str):
+    agent.process_message(AgentSpeakMessage("achieve", goal, "test"))
+
+
+async def settle():
+    await asyncio.sleep(0.1)
+
+
+def test_subscribe_sends_current_beliefs_then_changes(tmp_path):
+    async def main():
+        agent, recorder = make_agent(tmp_path)
+        await agent.startup()
+        agent.subscribe(PEER, "secret")
+        await settle()
+        achieve(agent, "set(2)")
+        await settle()
+        await agent.shutdown()
+        return recorder.sent
+
+    assert asyncio.run(main()) == [[("tell", "secret(1)")], [("tell", "secret(2)")]]
+
+
+def test_changes_are_merged(tmp_path):
+    async def main():
+        agent, recorder = make_agent(tmp_path)
+        await agent.startup()
+        agent.subscribe(PEER, "secret")
+        await settle()
+        # within one window: secret(2) comes and goes, secret(1) goes, secret(3) comes
+        achieve(agent, "set(2)")
+        achieve(agent, "unset(2)")
+        achieve(agent, "unset(1)")
+        achieve(agent, "set(3)")
+        await settle()
+        await agent.shutdown()
+        return recorder.sent
+
+    assert asyncio.run(main()) == [
+        [("tell", "secret(1)")],
+        [("untell", "secret(1)"), ("tell", "secret(3)")],
+    ]
+
+
+def test_one_message_in_flight_per_subscriber(tmp_path):
+    async def main():
+        agent, recorder = make_agent(tmp_path)
+        recorder.release = asyncio.Event()
+        await agent.startup()
+        agent.subscribe(PEER, "secret")
+        await settle()
+        # the initial beliefs are not sent yet: the changes wait for them
+        achieve(agent, "unset(1)")
+        await settle()
+        assert recorder.sent == []
+        recorder.release.set()
+        await settle()
+        await agent.shutdown()
+        return recorder.sent
+
+    assert asyncio.run(main()) == [[("tell", "secret(1)")], [("untell", "secret(1)")]]
+
+
+def test_unsubscribe(tmp_path):
+    async def main():
+        agent, recorder = make_agent(tmp_path)
+        await agent.startup()
+        agent.subscribe(PEER, "secret")
+        achieve(agent, "set(2)")
+        agent.unsubscribe(PEER, "secret")
+        await settle()
+        achieve(agent, "set(3)")
+        await settle()
+        await agent.shutdown()
+        return recorder.sent, agent.subscriptions
+
+    assert asyncio.run(main()) == ([], {})
+
+
+def test_subscribe_before_the_event_loop_is_known(tmp_path):
+    agent, recorder = make_agent(tmp_path)
+    agent.subscribe(PEER, "secret")
+    achieve(agent, "set(2)")  # inline mode: the changes are collected now
+
+    async def main():
+        await agent.startup()
+        await settle()
+        await agent.shutdown()
+        return recorder.sent
+
+    assert asyncio.run(main()) == [[("tell", "secret(1)"), ("tell", "secret(2)")]]
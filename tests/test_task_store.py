@@ -0,0 +1,83 @@
+import asyncio
+
+from a2a.types import Task, TaskState, TaskStatus
+
+from a2a_agentspeak import task_store
+from a2a_agentspeak.task_store import BoundedTaskStore
+
+
+def task(task_id: str, state: TaskState = TaskState.completed) -> Task:
+    return Task(id=task_id, context_id="c", status=TaskStatus(state=state))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run(store: BoundedTaskStore, *steps):
+    """Run the operations of the store in order: a Task is saved, a str is read."""
+
+    async def main():
+        for s in steps:
+            if isinstance(s, Task):
+                await store.save(s)
+            else:
+                await store.get(s)
+
+    asyncio.run(main())
+
+
+def test_least_recently_used_terminal_task_is_evicted():
+    store = BoundedTaskStore(max_tasks=3)
+    run(store, task("a"), task("b"), task("c"), "a", task("d"))
+    assert list(store.tasks) == ["c", "a", "d"]
+    assert store.evicted == 1
+
+
+def test_tasks_in_progress_are_not_evicted():
+    store = BoundedTaskStore(max_tasks=2)
+    run(
+        store,
+        task("a", TaskState.working),
+        task("b", TaskState.input_required),
+        task("c"),
+        task("d", TaskState.working),
+    )
+    # over the limit, but only the terminal task can go
+    assert list(store.tasks) == ["a", "b", "d"]
+    run(store, task("a"))  # a is over: it can be evicted now
+    assert list(store.tasks) == ["b", "d"]
+
+
+def test_max_bytes():
+    size = len(task("a").model_dump_json(exclude_none=True))
+    store = BoundedTaskStore(max_tasks=100, max_bytes=2 * size)
+    run(store, task("a"), task("w", TaskState.working), task("b"))
+    assert list(store.tasks) == ["w", "b"]
+    assert store.bytes <= 2 * size
+
+
+def test_ttl_expires_all_tasks(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(task_store.time, "monotonic", clock)
+    store = BoundedTaskStore(ttl=60)
+    run(store, task("a", TaskState.working), task("b"))
+    clock.now += 30
+    run(store, "a")  # used again: its ttl starts again
+    clock.now += 40
+    run(store, "b")
+    assert list(store.tasks) == ["a"]
+    clock.now += 60
+    run(store, "a")
+    assert len(store) == 0
+    assert store.expired == 2
+
+
+def test_terminal_tasks_not_kept():
+    store = BoundedTaskStore(keep_terminal=False)
+    run(store, task("a", TaskState.working), task("a"))
+    assert len(store) == 0 and store.bytes == 0
@@ -0,0 +1,35 @@
+import pytest
+
+import agentspeak
+
+from a2a_agentspeak.asl_message import lit_of_str, lit_of_str_eval
+from a2a_agentspeak.term_parser import TermSyntaxError, parse_literal
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (r'spec("a\nb")', "a\nb"),
+        (r'spec("tab\there")', "tab\there"),
+        (r'spec("\u00e9t\u00e9")', "été"),
+        (r'spec("say \"hi\"")', 'say "hi"'),
+        (r'spec("back\\slash")', "back\\slash"),
+        (r"spec('single \'quote\'')", "single 'quote'"),
+        ('spec("no escape")', "no escape"),
+    ],
+)
+def test_string_escapes(text, expected):
+    assert parse_literal(text).args == (expected,)
+
+
+def test_escapes_round_trip():
+    lit = agentspeak.Literal("spec", ('line 1\nline "2"\t\\ é',))
+    assert parse_literal(str(lit)) == lit
+
+
+@pytest.mark.parametrize("text", [r'spec("C:\xyz")', r'spec("\N")', r'spec("\u12")'])
+def test_invalid_escapes(text):
+    with pytest.raises(TermSyntaxError):
+        parse_literal(text)
+    # the message is still accepted, as before the parser
+    assert lit_of_str(text) == lit_of_str_eval(text)
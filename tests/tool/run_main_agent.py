@@ -1,5 +1,6 @@
 import context
 
+import asyncio
 import threading
 import uvicorn
 
@@ -21,12 +22,19 @@ if __name__ == "__main__":
     def square(x):
         return x * x
 
+    async def slow_square(x):
+        await asyncio.sleep(1)
+        return x * x
+
     # define agent interface and implementation
     a = from_file(
         name + ".asi",
         name + ".asl",
         build_url(host, port),
-        [Tool("function", ".square", (int,), square)],
+        [
+            Tool("function", ".square", (int,), square),
+            Tool("coroutine", ".slow_square", (int,), slow_square),
+        ],
     )
 
     # build and run the a2a server